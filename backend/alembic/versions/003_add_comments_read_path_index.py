@@ -0,0 +1,32 @@
+"""add composite read-path index to comments
+
+Revision ID: 003_comments_read_index
+Revises: 002_add_deleted_at
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_comments_read_index'
+down_revision = '002_add_deleted_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Covers the get_comments filter (video_id, deleted_at IS NULL) and its
+    # ORDER BY timestamp_seconds, created_at, id so no sort step is needed.
+    # Partial on live rows for both Postgres and SQLite (ignored elsewhere).
+    op.create_index(
+        'ix_comments_video_live_order',
+        'comments',
+        ['video_id', 'timestamp_seconds', 'created_at', 'id'],
+        postgresql_where=sa.text('deleted_at IS NULL'),
+        sqlite_where=sa.text('deleted_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_video_live_order', table_name='comments')
@@ -0,0 +1,27 @@
+"""add comment_version to videos
+
+Revision ID: 004_add_comment_version
+Revises: 003_comments_read_index
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_add_comment_version'
+down_revision = '003_comments_read_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-video counter bumped on every comment insert/soft delete; used for ETags
+    op.add_column(
+        'videos',
+        sa.Column('comment_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('videos', 'comment_version')
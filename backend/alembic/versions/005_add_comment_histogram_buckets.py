@@ -0,0 +1,49 @@
+"""add comment histogram buckets
+
+Revision ID: 005_comment_histogram
+Revises: 004_add_comment_version
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_comment_histogram'
+down_revision = '004_add_comment_version'
+branch_labels = None
+depends_on = None
+
+# Must match app.histogram.HISTOGRAM_RESOLUTIONS
+RESOLUTIONS = (1, 5, 30)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'comment_histogram_buckets',
+        sa.Column('video_id', sa.String(), nullable=False),
+        sa.Column('resolution_seconds', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('video_id', 'resolution_seconds', 'bucket'),
+        sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ondelete='CASCADE')
+    )
+    
+    # Backfill from existing live comments
+    if op.get_bind().dialect.name == 'postgresql':
+        bucket_expr = 'CAST(FLOOR(timestamp_seconds / {res}) AS INTEGER)'
+    else:
+        bucket_expr = 'CAST(timestamp_seconds / {res} AS INTEGER)'
+    for res in RESOLUTIONS:
+        expr = bucket_expr.format(res=res)
+        op.execute(f"""
+            INSERT INTO comment_histogram_buckets (video_id, resolution_seconds, bucket, count)
+            SELECT video_id, {res}, {expr}, COUNT(*)
+            FROM comments
+            WHERE deleted_at IS NULL
+            GROUP BY video_id, {expr}
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table('comment_histogram_buckets')
@@ -0,0 +1,32 @@
+"""add users table
+
+Revision ID: 006_add_users
+Revises: 005_comment_histogram
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_add_users'
+down_revision = '005_comment_histogram'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Users previously lived in an in-memory dict in app/auth.py
+    op.create_table(
+        'users',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('picture', sa.String(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('users')
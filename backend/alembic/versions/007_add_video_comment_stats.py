@@ -0,0 +1,60 @@
+"""add denormalized video comment stats
+
+Revision ID: 007_video_comment_stats
+Revises: 006_add_users
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_video_comment_stats'
+down_revision = '006_add_users'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('videos', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('videos', sa.Column('author_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('videos', sa.Column('last_activity_at', sa.DateTime(), nullable=True))
+    op.create_table(
+        'comment_author_counts',
+        sa.Column('video_id', sa.String(), nullable=False),
+        sa.Column('author_key', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('video_id', 'author_key'),
+        sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ondelete='CASCADE')
+    )
+    
+    # Backfill from existing comments (same author key rule as app.video_stats)
+    op.execute("""
+        INSERT INTO comment_author_counts (video_id, author_key, count)
+        SELECT video_id, COALESCE(author_id, 'guest:' || COALESCE(author_name, '')), COUNT(*)
+        FROM comments
+        WHERE deleted_at IS NULL
+        GROUP BY video_id, COALESCE(author_id, 'guest:' || COALESCE(author_name, ''))
+    """)
+    op.execute("""
+        UPDATE videos SET
+            comment_count = (
+                SELECT COUNT(*) FROM comments
+                WHERE comments.video_id = videos.id AND comments.deleted_at IS NULL
+            ),
+            author_count = (
+                SELECT COUNT(*) FROM comment_author_counts
+                WHERE comment_author_counts.video_id = videos.id
+            ),
+            last_activity_at = (
+                SELECT MAX(COALESCE(comments.deleted_at, comments.created_at)) FROM comments
+                WHERE comments.video_id = videos.id
+            )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('comment_author_counts')
+    op.drop_column('videos', 'last_activity_at')
+    op.drop_column('videos', 'author_count')
+    op.drop_column('videos', 'comment_count')
@@ -0,0 +1,24 @@
+"""add catalog pagination index to videos
+
+Revision ID: 008_videos_catalog_index
+Revises: 007_video_comment_stats
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008_videos_catalog_index'
+down_revision = '007_video_comment_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # get_videos orders by created_at DESC, id DESC and seeks with
+    # (created_at, id) < cursor; a backward scan of this index serves both
+    op.create_index('ix_videos_created_at_id', 'videos', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_created_at_id', table_name='videos')
@@ -0,0 +1,61 @@
+"""add full-text search index on comment bodies
+
+Revision ID: 009_comment_search_index
+Revises: 008_videos_catalog_index
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009_comment_search_index'
+down_revision = '008_videos_catalog_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Same index as app.search (SQLITE_SEARCH_DDL / POSTGRES_SEARCH_DDL)
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY keeps comment writes flowing while the index builds; it
+        # cannot run inside the migration's transaction
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_comments_body_search "
+                "ON comments USING gin (to_tsvector('english', body))"
+            )
+        return
+    op.execute("""
+        CREATE VIRTUAL TABLE comments_fts USING fts5(
+            body, comment_id UNINDEXED, tokenize='porter unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER comments_fts_insert AFTER INSERT ON comments BEGIN
+            INSERT INTO comments_fts (body, comment_id) VALUES (new.body, new.id);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER comments_fts_delete AFTER DELETE ON comments BEGIN
+            DELETE FROM comments_fts WHERE comment_id = old.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER comments_fts_update AFTER UPDATE OF body ON comments BEGIN
+            DELETE FROM comments_fts WHERE comment_id = old.id;
+            INSERT INTO comments_fts (body, comment_id) VALUES (new.body, new.id);
+        END
+    """)
+    # Backfill existing comments
+    op.execute("INSERT INTO comments_fts (body, comment_id) SELECT body, id FROM comments")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_comments_body_search")
+        return
+    op.execute("DROP TRIGGER IF EXISTS comments_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS comments_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS comments_fts_insert")
+    op.execute("DROP TABLE IF EXISTS comments_fts")
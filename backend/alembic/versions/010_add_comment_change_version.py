@@ -0,0 +1,30 @@
+"""add change_version to comments for delta sync
+
+Revision ID: 010_comment_change_version
+Revises: 009_comment_search_index
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_comment_change_version'
+down_revision = '009_comment_search_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The video's comment_version taken by a comment's insert/soft delete;
+    # existing rows keep 0, which sorts before every later change
+    op.add_column(
+        'comments',
+        sa.Column('change_version', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.create_index('ix_comments_video_changes', 'comments', ['video_id', 'change_version', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_video_changes', table_name='comments')
+    op.drop_column('comments', 'change_version')
@@ -0,0 +1,24 @@
+"""add last_activity_at index to videos
+
+Revision ID: 011_videos_activity_index
+Revises: 010_comment_change_version
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '011_videos_activity_index'
+down_revision = '010_comment_change_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The GET /videos ETag includes max(last_activity_at); with this index
+    # that is one lookup instead of a scan of the videos table
+    op.create_index('ix_videos_last_activity_at', 'videos', ['last_activity_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_last_activity_at', table_name='videos')
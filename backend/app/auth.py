@@ -3,15 +3,27 @@ Authentication utilities for ReMo
 - Google ID token verification
 - JWT access token creation
 - User authentication dependency
+- Persistent user store (users table) with a TTL cache in front
 """
 import os
 import jwt
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Dict, Tuple
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+import logging
 from fastapi import HTTPException, Security, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.cache import TTLCache
+from app.db import PrimaryReadSessionLocal, WriteSessionLocal
+from app.models import User
 
 # Configuration
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
@@ -19,11 +31,182 @@ JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRY_DAYS = 7
 
+logger = logging.getLogger(__name__)
+
+# Google ID token verification
+GOOGLE_OAUTH2_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+GOOGLE_CERTS_REFRESH_MARGIN_SECONDS = 300  # refresh in the background this long before expiry
+GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS = 3600  # used when Cache-Control has no max-age
+
+# User lookup cache: get_current_user runs on every authenticated request
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+
+# Verified access-token cache: skips the HMAC check for a bearer token seen recently
+# (entries never outlive the token's own exp)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
 # Security scheme for Bearer token
 security = HTTPBearer()
 
-# In-memory user store (demo: could be replaced with database)
-users_store: Dict[str, Dict] = {}
+# Users are persisted in the users table; this process-local cache sits in
+# front of it (write-through from upsert_user, TTL bounds cross-worker staleness)
+_user_cache = TTLCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
+# sha256(token) -> decoded payload; keyed by digest so raw tokens are not kept in memory
+_token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL_SECONDS)
+
+
+# Cert source: returns ({key id: x509 certificate PEM}, max_age_seconds)
+CertSource = Callable[[], Tuple[Dict[str, str], float]]
+
+
+def _parse_max_age(cache_control: Optional[str]) -> float:
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    return float(match.group(1)) if match else GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS
+
+
+class GoogleCertFetcher:
+    """Default cert source: Google's cert endpoint over a pooled keep-alive session"""
+
+    def __init__(self, url: str = GOOGLE_OAUTH2_CERTS_URL, timeout: float = 5):
+        import requests as http
+        self.url = url
+        self.timeout = timeout
+        self._session = http.Session()
+        self._session.mount("https://", http.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+    def __call__(self) -> Tuple[Dict[str, str], float]:
+        response = self._session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json(), _parse_max_age(response.headers.get("Cache-Control"))
+
+
+class GoogleIdTokenVerifier:
+    """
+    Verifies Google ID tokens against a cached copy of Google's signing certs.
+    - Certs are kept until their Cache-Control max-age expires and refreshed in
+      a background thread shortly before that, so logins never wait on Google
+    - A token signed with an unknown key id (key rotation) forces one refresh,
+      at most every min_forced_refresh_seconds; concurrent callers that hit
+      the same unknown key wait for that one fetch instead of starting their own
+    - cert_source is injectable so tests can use a local key set
+    """
+
+    def __init__(
+        self,
+        cert_source: Optional[CertSource] = None,
+        refresh_margin_seconds: float = GOOGLE_CERTS_REFRESH_MARGIN_SECONDS,
+        min_forced_refresh_seconds: float = 30,
+        clock: Callable[[], float] = time.time
+    ):
+        self._cert_source = cert_source
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_forced_refresh_seconds = min_forced_refresh_seconds
+        self.clock = clock
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._generation = 0  # bumped by every completed fetch
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._background_refresh: Optional[threading.Thread] = None
+
+    @property
+    def cert_source(self) -> CertSource:
+        if self._cert_source is None:
+            self._cert_source = GoogleCertFetcher()
+        return self._cert_source
+
+    def _refresh(self) -> Dict[str, str]:
+        certs, max_age = self.cert_source()
+        now = self.clock()
+        with self._lock:
+            self._certs = certs
+            self._fetched_at = now
+            self._expires_at = now + max_age
+            self._generation += 1
+        logger.info(f"[AUTH] Fetched {len(certs)} Google signing certs (max-age={int(max_age)}s)")
+        return certs
+
+    def _refresh_in_background(self) -> None:
+        def run():
+            try:
+                self._refresh()
+            except Exception as e:
+                # Keep serving the current certs until they expire
+                logger.warning(f"[AUTH] Background Google cert refresh failed: {str(e)}")
+        with self._lock:
+            if self._background_refresh is not None and self._background_refresh.is_alive():
+                return
+            self._background_refresh = threading.Thread(target=run, name="google-cert-refresh", daemon=True)
+            self._background_refresh.start()
+
+    def get_certs(self) -> Dict[str, str]:
+        now = self.clock()
+        if now >= self._expires_at:
+            # Single flight: concurrent callers wait here and reuse one fetch
+            with self._refresh_lock:
+                if self.clock() >= self._expires_at:
+                    return self._refresh()
+            return self._certs
+        if now >= self._expires_at - self.refresh_margin_seconds:
+            self._refresh_in_background()
+        return self._certs
+
+    def refresh_certs(self, seen_generation: int) -> Dict[str, str]:
+        """
+        Forced refresh, single flight: fetches only if no fetch has completed
+        since the caller read seen_generation (otherwise returns those certs)
+        """
+        with self._refresh_lock:
+            if self._generation == seen_generation:
+                return self._refresh()
+        return self._certs
+
+    def verify(self, token: str, audience: Optional[str]) -> Dict:
+        """
+        Verify signature, expiry, audience and issuer; returns the token claims.
+        Raises ValueError if the token is invalid.
+        """
+        generation = self._generation
+        certs = self.get_certs()
+        key_id = _unverified_key_id(token)
+        if key_id and key_id not in certs and self.clock() - self._fetched_at >= self.min_forced_refresh_seconds:
+            certs = self.refresh_certs(generation)
+
+        # Imported lazily: google-auth pulls in its crypto backends (slow cold start)
+        from google.auth import jwt as google_jwt
+        idinfo = google_jwt.decode(token, certs=certs, audience=audience)
+        if idinfo.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+        return idinfo
+
+
+def _unverified_key_id(token: str) -> Optional[str]:
+    try:
+        header = token.split(".")[0]
+        return json.loads(base64.urlsafe_b64decode(header + "=" * (-len(header) % 4))).get("kid")
+    except Exception:
+        raise ValueError("Malformed token")
+
+
+_google_verifier: Optional[GoogleIdTokenVerifier] = None
+
+
+def get_google_verifier() -> GoogleIdTokenVerifier:
+    global _google_verifier
+    if _google_verifier is None:
+        _google_verifier = GoogleIdTokenVerifier()
+    return _google_verifier
+
+
+def set_google_verifier(verifier: GoogleIdTokenVerifier) -> None:
+    """Swap the verifier (tests use a local cert source)"""
+    global _google_verifier
+    _google_verifier = verifier
 
 
 def verify_google_id_token(id_token_str: str) -> Dict:
@@ -36,11 +219,7 @@ def verify_google_id_token(id_token_str: str) -> Dict:
     
     try:
         # Verify the token
-        idinfo = id_token.verify_oauth2_token(
-            id_token_str,
-            requests.Request(),
-            GOOGLE_CLIENT_ID
-        )
+        idinfo = get_google_verifier().verify(id_token_str, GOOGLE_CLIENT_ID)
         
         # Verify the token is intended for our client
         if idinfo['aud'] != GOOGLE_CLIENT_ID:
@@ -75,35 +254,77 @@ def create_access_token(user_id: str, email: str, name: str) -> str:
 def verify_access_token(token: str) -> Dict:
     """
     Verify and decode JWT access token
-    Returns user payload if valid
+    Returns user payload if valid (recently verified tokens come from _token_cache)
     Raises HTTPException if invalid
     """
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(digest)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        exp = payload.get('exp')
+        if exp is not None:
+            _token_cache.set(digest, payload, ttl_seconds=exp - time.time())
+        return dict(payload)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
-async def get_current_user(
+def _user_to_dict(user: User) -> Dict:
+    return {
+        'id': user.id,
+        'email': user.email or '',
+        'name': user.name or '',
+        'picture': user.picture or '',
+        'updated_at': user.updated_at.isoformat(),
+    }
+
+
+def get_user(user_id: str) -> Optional[Dict]:
+    """
+    Look up a user, from the cache when possible.
+    Returns None if the user does not exist.
+    """
+    user = _user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    # Primary, not the replica: a user upserted at sign-in must be found by
+    # the very next request even while the replica is behind
+    db = PrimaryReadSessionLocal()
+    try:
+        row = db.query(User).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        user = _user_to_dict(row)
+    finally:
+        db.close()
+    _user_cache.set(user_id, user)
+    return user
+
+
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Security(security)
 ) -> Dict:
     """
     FastAPI dependency to get current authenticated user
+    (plain def: a cache miss reads the users table, so it runs in the threadpool)
     """
     token = credentials.credentials
     payload = verify_access_token(token)
     
     # Verify user still exists in store
     user_id = payload.get('sub')
-    if user_id and user_id in users_store:
-        user = users_store[user_id]
+    user = get_user(user_id) if user_id else None
+    if user:
         return {
             'id': user_id,
-            'email': user.get('email', payload.get('email', '')),
-            'name': user.get('name', payload.get('name', '')),
+            'email': user.get('email') or payload.get('email', ''),
+            'name': user.get('name') or payload.get('name', ''),
             'picture': user.get('picture', ''),
         }
     
@@ -112,15 +333,34 @@ async def get_current_user(
 
 def upsert_user(google_user: Dict) -> Dict:
     """
-    Upsert user in the store
+    Upsert user in the store (write-through to the cache)
     Returns user dict
     """
     user_id = google_user['sub']
-    users_store[user_id] = {
+    values = {
         'id': user_id,
         'email': google_user.get('email', ''),
         'name': google_user.get('name', ''),
         'picture': google_user.get('picture', ''),
-        'updated_at': datetime.utcnow().isoformat(),
+        'updated_at': datetime.now(timezone.utc),
     }
-    return users_store[user_id]
+
+    db = WriteSessionLocal()
+    try:
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(User.__table__).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={key: stmt.excluded[key] for key in values if key != 'id'},
+        )
+        db.execute(stmt)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    user = {**values, 'updated_at': values['updated_at'].isoformat()}
+    _user_cache.set(user_id, user)
+    return user
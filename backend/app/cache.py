@@ -0,0 +1,189 @@
+"""
+In-process caches for ReMo
+- CommentPageCache: serialized comment pages, bounded by total payload bytes
+  with LRU eviction; a video's entries are invalidated whenever one of its
+  comments is created or deleted
+- TTLCache: small bounded LRU with per-entry expiry for per-request lookups
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional, Set, Tuple
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Total bytes of serialized pages kept in memory (0 disables the cache)
+COMMENT_CACHE_MAX_BYTES = int(os.getenv("COMMENT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Upper bound on staleness: invalidation is per-process, so another worker's
+# write is only seen here once the entry expires
+COMMENT_CACHE_TTL_SECONDS = float(os.getenv("COMMENT_CACHE_TTL_SECONDS", "10"))
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+    expires_at: float
+
+
+class CommentPageCache:
+    """
+    Thread-safe LRU of serialized comment pages keyed by (video_id, query params).
+    Writers call invalidate(video_id); readers take generation(video_id) before
+    querying and pass it to put() so a page read before a write can never be
+    stored after that write's invalidation.
+    """
+
+    def __init__(self, max_bytes: int = COMMENT_CACHE_MAX_BYTES, ttl_seconds: float = COMMENT_CACHE_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, Hashable], CachedPage]" = OrderedDict()
+        self._keys_by_video: Dict[str, Set[Tuple[str, Hashable]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def generation(self, video_id: str) -> int:
+        with self._lock:
+            return self._generations.get(video_id, 0)
+
+    def get(self, video_id: str, params: Hashable) -> Optional[CachedPage]:
+        key = (video_id, params)
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            if page.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, video_id: str, params: Hashable, body: bytes, headers: Dict[str, str], generation: int) -> None:
+        size = len(body)
+        if not self.enabled or size > self.max_bytes:
+            return
+        key = (video_id, params)
+        with self._lock:
+            if self._generations.get(video_id, 0) != generation:
+                # A write landed while this page was being read
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CachedPage(body, headers, time.monotonic() + self.ttl_seconds)
+            self._keys_by_video.setdefault(video_id, set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, video_id: str) -> None:
+        """Drop every cached page for a video (call after committing a write)"""
+        with self._lock:
+            self._generations[video_id] = self._generations.get(video_id, 0) + 1
+            keys = self._keys_by_video.pop(video_id, ())
+            for key in keys:
+                page = self._entries.pop(key, None)
+                if page is not None:
+                    self._bytes -= len(page.body)
+            if keys:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_video.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Tuple[str, Hashable]) -> None:
+        # Caller holds the lock
+        page = self._entries.pop(key)
+        self._bytes -= len(page.body)
+        keys = self._keys_by_video.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_video[key[0]]
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU mapping whose entries expire after a TTL.
+    Bounded by entry count; set() may pass a shorter per-entry lifetime.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[object, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, self.clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache instance
+comment_cache = CommentPageCache()
@@ -0,0 +1,215 @@
+"""
+Comment write path for ReMo
+- insert_comments: bulk INSERT ... RETURNING plus the per-video bookkeeping
+  (comment_version, density histogram, comment stats) in the caller's transaction
+- bump_comment_version: hands out change versions; the UPDATE locks the video
+  row until commit, so one video's versions commit in increasing order (the
+  delta-sync watermark relies on this)
+- CommentWriteBuffer: opt-in group commit; concurrent comment inserts are
+  queued and flushed together in one transaction every few milliseconds
+"""
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import queue
+import threading
+import time
+import logging
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.histogram import adjust_comment_histogram_many
+from app.models import Comment, Video
+from app.video_stats import record_comments_added
+
+logger = logging.getLogger(__name__)
+
+# Group commit configuration (off by default)
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() in ("1", "true", "yes")
+GROUP_COMMIT_INTERVAL_MS = float(os.getenv("GROUP_COMMIT_INTERVAL_MS", "5"))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "100"))
+
+# How long a request waits for its batch to be flushed
+GROUP_COMMIT_TIMEOUT_SECONDS = 30
+
+
+def bump_comment_version(db: Session, video_id: str, amount: int = 1) -> Optional[int]:
+    """
+    Advance a video's comment_version in the caller's transaction.
+    Returns the new version (None if the video does not exist); the versions
+    new - amount + 1 .. new belong to this transaction.
+    """
+    return db.execute(
+        update(Video)
+        .where(Video.id == video_id)
+        .values(comment_version=Video.comment_version + amount)
+        .returning(Video.comment_version)
+    ).scalar()
+
+
+def insert_comments(db: Session, rows: List[Dict]) -> List[Dict]:
+    """
+    Insert comment rows (video_id, author_name, author_id, timestamp_seconds, body)
+    with one executemany INSERT ... RETURNING and update each video's version,
+    histogram and comment stats. Does not commit. Returns the stored rows as dicts, in input order
+    (plain rows, so nothing is lazily reloaded after the commit).
+    """
+    indexes_by_video: Dict[str, List[int]] = defaultdict(list)
+    for index, row in enumerate(rows):
+        indexes_by_video[row["video_id"]].append(index)
+
+    # Versions first (fixed order, so concurrent transactions lock videos the
+    # same way): each row is stamped with its own change_version
+    change_versions = [0] * len(rows)
+    for video_id in sorted(indexes_by_video):
+        indexes = indexes_by_video[video_id]
+        # (None for an unknown video: no version to stamp, any value will do)
+        last_version = bump_comment_version(db, video_id, len(indexes)) or len(indexes)
+        for version, index in enumerate(indexes, start=last_version - len(indexes) + 1):
+            change_versions[index] = version
+
+    table = Comment.__table__
+    stored = db.execute(
+        insert(table).returning(*table.c, sort_by_parameter_order=True),
+        [{**row, "deleted_at": None, "change_version": version} for row, version in zip(rows, change_versions)]
+    ).all()
+
+    for video_id in sorted(indexes_by_video):
+        video_rows = [rows[index] for index in indexes_by_video[video_id]]
+        adjust_comment_histogram_many(db, video_id, [row["timestamp_seconds"] for row in video_rows], 1)
+        record_comments_added(db, video_id, video_rows)
+
+    return [dict(row._mapping) for row in stored]
+
+
+class CommentWriteBuffer:
+    """
+    Group commit for comment inserts.
+    submit() queues a row and blocks the calling (threadpool) request until a
+    background flusher has committed it. The flusher takes whatever is queued,
+    waiting at most interval_seconds after the first row or until max_batch
+    rows, and writes the lot in one transaction. If a batch fails, its rows are
+    retried one at a time so a single bad row only fails its own request.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: float = GROUP_COMMIT_INTERVAL_MS / 1000,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[Dict, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+
+    def submit(self, row: Dict, timeout: float = GROUP_COMMIT_TIMEOUT_SECONDS) -> Dict:
+        """Queue a comment row and wait for it to be committed; returns the stored row"""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((row, future))
+        return future.result(timeout=timeout)
+
+    def stats(self) -> Dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_batch_size": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            "interval_ms": self.interval_seconds * 1000,
+            "max_batch": self.max_batch,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="comment-group-commit", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval_seconds
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # The flusher must outlive any failure, or every later submit() hangs
+                logger.error(f"[GROUP_COMMIT] Flush failed: {str(e)}", exc_info=True)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _flush(self, batch: List[Tuple[Dict, Future]]) -> None:
+        db = None
+        try:
+            db = self.session_factory()
+            stored = insert_comments(db, [row for row, _ in batch])
+            db.commit()
+        except Exception as e:
+            if db is not None:
+                db.rollback()
+            stored = None
+            error = e
+        finally:
+            if db is not None:
+                db.close()
+
+        if stored is not None:
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, future), result in zip(batch, stored):
+                future.set_result(result)
+            return
+
+        if db is None:
+            # No session (pool timeout, database unavailable): not a bad row,
+            # so fail the whole batch instead of retrying row by row
+            logger.error(f"[GROUP_COMMIT] Could not open a session for {len(batch)} comments: {str(error)}", exc_info=error)
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        if len(batch) == 1:
+            logger.error(f"[GROUP_COMMIT] Comment insert failed: {str(error)}", exc_info=error)
+            batch[0][1].set_exception(error)
+            return
+        logger.warning(f"[GROUP_COMMIT] Batch of {len(batch)} failed, retrying rows individually: {str(error)}")
+        for item in batch:
+            self._flush([item])
+
+
+_write_buffer: Optional[CommentWriteBuffer] = None
+_write_buffer_lock = threading.Lock()
+
+
+def get_comment_write_buffer() -> Optional[CommentWriteBuffer]:
+    """The process-wide group-commit buffer, or None when group commit is off"""
+    global _write_buffer
+    if GROUP_COMMIT_ENABLED and _write_buffer is None:
+        with _write_buffer_lock:
+            if _write_buffer is None:
+                from app.db import WriteSessionLocal
+                _write_buffer = CommentWriteBuffer(WriteSessionLocal)
+                logger.info(f"[GROUP_COMMIT] Enabled (interval={GROUP_COMMIT_INTERVAL_MS}ms, max_batch={GROUP_COMMIT_MAX_BATCH})")
+    return _write_buffer
+
+
+def set_comment_write_buffer(buffer: Optional[CommentWriteBuffer]) -> None:
+    """Install a buffer (or None to write each comment in its own transaction)"""
+    global _write_buffer
+    _write_buffer = buffer
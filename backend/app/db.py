@@ -3,11 +3,16 @@ Database configuration and session management for ReMo
 Supports both SQLite (local dev) and Postgres (production)
 """
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 import logging
 
+from fastapi import Request
+
+from app.metrics import TimedQueuePool, db_read_routing, instrument_engine, timed_pool_class
+from app.read_routing import should_read_primary
+
 logger = logging.getLogger(__name__)
 
 # Get DATABASE_URL from environment, default to SQLite for local dev
@@ -24,30 +29,170 @@ if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg2://", 1)
     logger.info("[DB] Converted postgres:// to postgresql+psycopg2://")
 
+# Tuned SQLite mode for small production deployments (see README):
+# WAL + pragmas on every connection, a pool of read-only connections for
+# read routes and a single serialized writer connection for everything else
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "false").lower() in ("1", "true", "yes")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(16 * 1024)))  # per connection
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+SQLITE_WRITER_TIMEOUT_SECONDS = float(os.getenv("SQLITE_WRITER_TIMEOUT_SECONDS", "30"))
+
+# Execution option set on the write-path engine: tuned SQLite starts its
+# transactions with BEGIN IMMEDIATE (ignored by other backends)
+SQLITE_IMMEDIATE_OPTION = "sqlite_begin_immediate"
+
+# Optional read replica: read-only routes use it, writes stay on DATABASE_URL
+# (with read-your-writes stickiness, see app.read_routing)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith("postgres://"):
+    DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace("postgres://", "postgresql+psycopg2://", 1)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, query_only: bool) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        if query_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def _configure_sqlite_writer(writer) -> None:
+    @event.listens_for(writer, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Take over transaction control from pysqlite so BEGIN can be IMMEDIATE
+        dbapi_connection.isolation_level = None
+        _apply_sqlite_pragmas(dbapi_connection, query_only=False)
+
+    @event.listens_for(writer, "begin")
+    def _on_begin(conn):
+        # Write paths (WriteSessionLocal) lock for writing up front: a deferred
+        # transaction that reads and then writes can fail with "database is
+        # locked" instead of waiting. Everything else (probes, read-your-writes
+        # reads) stays deferred so it never holds the write lock.
+        if conn.get_execution_options().get(SQLITE_IMMEDIATE_OPTION):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            conn.exec_driver_sql("BEGIN")
+
+
+def _configure_sqlite_reader(reader) -> None:
+    @event.listens_for(reader, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, query_only=True)
+
+
 # Determine database type
 if "sqlite" in DATABASE_URL:
     DB_SCHEME = "sqlite"
     # SQLite-specific configuration
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        echo=False  # Set to True for SQL query logging
-    )
-    logger.info("[DB] Using SQLite database (local development)")
+    in_memory = DATABASE_URL in ("sqlite://", "sqlite:///:memory:")
+    if SQLITE_TUNED and in_memory:
+        logger.warning("[DB] SQLITE_TUNED ignored for an in-memory database")
+    if SQLITE_TUNED and not in_memory:
+        # Writer: one connection, so writes are serialized in this process
+        engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=timed_pool_class("writer"),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=SQLITE_WRITER_TIMEOUT_SECONDS,
+            echo=False
+        )
+        _configure_sqlite_writer(engine)
+        primary_read_engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=timed_pool_class("reader"),
+            pool_size=SQLITE_READ_POOL_SIZE,
+            max_overflow=SQLITE_READ_POOL_SIZE,
+            echo=False
+        )
+        _configure_sqlite_reader(primary_read_engine)
+        logger.info(f"[DB] Using tuned SQLite (WAL, 1 writer, {SQLITE_READ_POOL_SIZE} readers)")
+    else:
+        engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            # Same pool SQLAlchemy picks for file databases, with checkout timing
+            **({} if in_memory else {"poolclass": TimedQueuePool}),
+            echo=False  # Set to True for SQL query logging
+        )
+        primary_read_engine = engine
+        logger.info("[DB] Using SQLite database (local development)")
 else:
     DB_SCHEME = "postgresql"
     # Postgres configuration
     engine = create_engine(
         DATABASE_URL,
+        poolclass=TimedQueuePool,  # QueuePool that records checkout wait (/metrics)
         pool_pre_ping=True,  # Verify connections before using
         pool_size=5,
         max_overflow=10,
         echo=False
     )
+    primary_read_engine = engine
     logger.info("[DB] Using Postgres database (production)")
 
-# Create session factory
+# Reads that must see the primary's latest commits use primary_read_engine
+# (tuned SQLite: the reader pool, never the single writer connection);
+# read-only routes use read_engine, the replica when one is configured
+read_engine = primary_read_engine
+
+if DATABASE_REPLICA_URL:
+    # The replica serves read-only routes in place of the local read engine;
+    # reads that must be current keep primary_read_engine
+    if "sqlite" in DATABASE_REPLICA_URL:
+        read_engine = create_engine(
+            DATABASE_REPLICA_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=timed_pool_class("replica"),
+            echo=False
+        )
+        _configure_sqlite_reader(read_engine)
+    else:
+        read_engine = create_engine(
+            DATABASE_REPLICA_URL,
+            poolclass=timed_pool_class("replica"),
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10,
+            echo=False
+        )
+    replica_host = DATABASE_REPLICA_URL.split("@")[-1]
+    logger.info(f"[DB] Read-only routes use the replica: {replica_host}")
+
+# Statement timing and pool gauges for /metrics
+# (pool=primary, or writer/reader/replica when reads use other engines)
+if read_engine is engine:
+    instrument_engine(engine)
+else:
+    for instrumented in dict.fromkeys((engine, primary_read_engine, read_engine)):
+        instrument_engine(instrumented, getattr(instrumented.pool, "pool_label", "primary"))
+
+# Create session factories. Transactions that write use WriteSessionLocal
+# (tuned SQLite takes the write lock at BEGIN) and SessionLocal is the same
+# engine and pool for everything else on the primary. Reads that must see
+# the latest commits use PrimaryReadSessionLocal, and read-only routes use
+# ReadSessionLocal; both are SessionLocal unless separate read engines exist.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+WriteSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine.execution_options(**{SQLITE_IMMEDIATE_OPTION: True})
+)
+PrimaryReadSessionLocal = SessionLocal if primary_read_engine is engine else sessionmaker(
+    autocommit=False, autoflush=False, bind=primary_read_engine
+)
+ReadSessionLocal = PrimaryReadSessionLocal if read_engine is primary_read_engine else sessionmaker(
+    autocommit=False, autoflush=False, bind=read_engine
+)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -62,15 +207,44 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def check_db_connection() -> bool:
-    """Check if database connection is healthy"""
+def get_write_db() -> Generator[Session, None, None]:
+    """Dependency for routes that write: a session whose transactions lock for writing up front"""
+    db = WriteSessionLocal()
     try:
-        with engine.connect() as conn:
-            conn.execute("SELECT 1")
-        return True
-    except Exception as e:
-        logger.error(f"[DB] Database connection check failed: {e}")
-        return False
+        yield db
+    finally:
+        db.close()
+
+
+def get_primary_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency for read-only routes that must see the latest commits (never the
+    replica). Tuned SQLite serves it from the reader pool, so it does not queue
+    behind writes on the writer connection. Never write through it.
+    """
+    db = PrimaryReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Dependency for read-only routes: a session on the read engine.
+    Never write through it (tuned SQLite readers are query_only).
+    With a replica, reads that must see a recent write go to the primary.
+    """
+    session_factory = ReadSessionLocal
+    if DATABASE_REPLICA_URL:
+        if should_read_primary(request):
+            session_factory = PrimaryReadSessionLocal
+        db_read_routing.inc("primary" if session_factory is PrimaryReadSessionLocal else "replica")
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
 
 
 def get_db_info():
@@ -97,17 +271,18 @@ def get_db_info():
         existing_tables = inspector.get_table_names()
         info["tables_present"] = existing_tables
         
-        # Count comments if comments table exists
-        if "comments" in existing_tables:
-            from app.models import Comment
-            from sqlalchemy.orm import Session
+        # Live comment total from the denormalized per-video counters
+        # (no scan of the comments table; see app.video_stats)
+        if "videos" in existing_tables:
+            from app.models import Video
+            from sqlalchemy import func
             db = SessionLocal()
             try:
-                info["comment_count"] = db.query(Comment).count()
+                info["comment_count"] = int(db.query(func.coalesce(func.sum(Video.comment_count), 0)).scalar())
             finally:
                 db.close()
     except Exception as e:
-        logger.error(f"[DB] Error getting DB info: {e}")
+        logger.error(f"[DB] Error getting DB info: {e}", exc_info=True)
         info["error"] = str(e)
     
     return info
@@ -0,0 +1,130 @@
+"""
+Database health monitoring for ReMo
+A background thread probes the database every few seconds and caches the
+result, so load-balancer probes of /health never open a connection; the deep
+probe runs a fresh check and adds connection-pool statistics
+"""
+from typing import Callable, Dict, Optional
+import os
+import threading
+import time
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.db import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background probes
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+
+# A cached result older than this many intervals is reported as stale
+HEALTH_STALE_AFTER_INTERVALS = 3
+
+
+def probe_database(engine: Engine) -> Dict:
+    """Run SELECT 1 on a pooled connection; returns ok, latency and any error"""
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        error = None
+    except Exception as e:
+        error = str(e)
+    return {
+        "ok": error is None,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+        "error": error,
+    }
+
+
+def pool_stats(engine: Engine) -> Dict:
+    """Checkout counters for the engine's pool (whichever the pool class exposes)"""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
+
+
+class DatabaseHealthMonitor:
+    """
+    Caches the latest database probe. start() launches a daemon thread that
+    re-probes every interval_seconds; snapshot() only reads the cached result.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        interval_seconds: float = HEALTH_CHECK_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.clock = clock
+        self._last: Optional[Dict] = None
+        self._consecutive_failures = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-health-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"[HEALTH] Background DB probe every {self.interval_seconds}s")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+
+    def check_now(self) -> Dict:
+        """Probe immediately and update the cached result"""
+        result = probe_database(self.engine)
+        result["checked_at"] = self.clock()
+        with self._lock:
+            was_ok = self._last is None or self._last["ok"]
+            self._consecutive_failures = 0 if result["ok"] else self._consecutive_failures + 1
+            self._last = result
+        if was_ok and not result["ok"]:
+            logger.error(f"[HEALTH] Database probe failed: {result['error']}")
+        elif not was_ok and result["ok"]:
+            logger.info("[HEALTH] Database probe recovered")
+        return result
+
+    def snapshot(self) -> Dict:
+        """Latest cached result; never touches the database"""
+        with self._lock:
+            last = self._last
+            failures = self._consecutive_failures
+        if last is None:
+            return {"database": "unknown", "checked_at": None, "age_seconds": None, "stale": True}
+        age = self.clock() - last["checked_at"]
+        return {
+            "database": "connected" if last["ok"] else "disconnected",
+            "checked_at": last["checked_at"],
+            "age_seconds": round(age, 3),
+            "stale": age > self.interval_seconds * HEALTH_STALE_AFTER_INTERVALS,
+            "latency_ms": last["latency_ms"],
+            "consecutive_failures": failures,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.check_now()
+            except Exception as e:
+                logger.error(f"[HEALTH] Probe loop error: {str(e)}", exc_info=True)
+            self._stop.wait(self.interval_seconds)
+
+
+# Process-wide monitor for the application engine
+db_health_monitor = DatabaseHealthMonitor(default_engine)
@@ -0,0 +1,105 @@
+"""
+Comment-density histogram for ReMo timeline markers
+Per-video bucket counts at a few fixed resolutions, kept up to date inside the
+same transaction as each comment insert/soft delete so reads never scan comments
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+from sqlalchemy import func, Integer, cast
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import logging
+
+from app.models import Comment, CommentHistogramBucket
+
+logger = logging.getLogger(__name__)
+
+# Supported bucket widths in seconds (each one is maintained on every write)
+HISTOGRAM_RESOLUTIONS = (1, 5, 30)
+
+
+def bucket_for(timestamp_seconds: float, resolution_seconds: int) -> int:
+    # Same arithmetic as the SQL backfill (divide, then floor)
+    return math.floor(timestamp_seconds / resolution_seconds)
+
+
+def adjust_comment_histogram(db: Session, video_id: str, timestamp_seconds: float, delta: int) -> None:
+    """Add delta (+1 insert, -1 soft delete) to the buckets covering a timestamp"""
+    adjust_comment_histogram_many(db, video_id, [timestamp_seconds], delta)
+
+
+def adjust_comment_histogram_many(db: Session, video_id: str, timestamps: Iterable[float], delta: int) -> None:
+    """
+    Add delta to the buckets of every timestamp, aggregated per bucket and
+    written as one executemany upsert. Runs in the caller's transaction;
+    buckets are upserted in a fixed order so concurrent writers cannot
+    deadlock on them.
+    """
+    deltas: Dict[Tuple[int, int], int] = {}
+    for timestamp_seconds in timestamps:
+        for resolution in HISTOGRAM_RESOLUTIONS:
+            key = (resolution, bucket_for(timestamp_seconds, resolution))
+            deltas[key] = deltas.get(key, 0) + delta
+    if not deltas:
+        return
+
+    dialect = db.get_bind().dialect.name
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    table = CommentHistogramBucket.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["video_id", "resolution_seconds", "bucket"],
+        set_={"count": table.c.count + stmt.excluded.count},
+    )
+    db.execute(stmt, [
+        {"video_id": video_id, "resolution_seconds": resolution, "bucket": bucket, "count": change}
+        for (resolution, bucket), change in sorted(deltas.items())
+    ])
+
+
+def get_comment_histogram(db: Session, video_id: str, resolution_seconds: int) -> List[Dict]:
+    """Non-empty buckets for a video, in timeline order"""
+    rows = db.query(CommentHistogramBucket.bucket, CommentHistogramBucket.count).filter(
+        CommentHistogramBucket.video_id == video_id,
+        CommentHistogramBucket.resolution_seconds == resolution_seconds,
+        CommentHistogramBucket.count > 0
+    ).order_by(CommentHistogramBucket.bucket.asc()).all()
+    return [{"start_seconds": bucket * resolution_seconds, "count": count} for bucket, count in rows]
+
+
+def rebuild_comment_histograms(db: Session, video_id: Optional[str] = None) -> int:
+    """
+    Recompute buckets from the comments table (one video, or all when video_id is None).
+    Used to backfill; commits and returns the number of bucket rows written.
+    """
+    delete_query = db.query(CommentHistogramBucket)
+    if video_id is not None:
+        delete_query = delete_query.filter(CommentHistogramBucket.video_id == video_id)
+    delete_query.delete(synchronize_session=False)
+
+    written = 0
+    for resolution in HISTOGRAM_RESOLUTIONS:
+        # timestamp_seconds is never negative, so truncation is floor division
+        bucket = cast(Comment.timestamp_seconds / resolution, Integer)
+        if db.get_bind().dialect.name == "postgresql":
+            # Postgres rounds on cast; floor explicitly
+            bucket = cast(func.floor(Comment.timestamp_seconds / resolution), Integer)
+        query = db.query(Comment.video_id, bucket, func.count(Comment.id)).filter(
+            Comment.deleted_at.is_(None)
+        )
+        if video_id is not None:
+            query = query.filter(Comment.video_id == video_id)
+        rows = query.group_by(Comment.video_id, bucket).all()
+        if rows:
+            db.execute(
+                CommentHistogramBucket.__table__.insert(),
+                [
+                    {"video_id": vid, "resolution_seconds": resolution, "bucket": b, "count": count}
+                    for vid, b, count in rows
+                ]
+            )
+            written += len(rows)
+    db.commit()
+    logger.info(f"[HISTOGRAM] Rebuilt {written} bucket rows (video_id={video_id or 'all'})")
+    return written
@@ -0,0 +1,138 @@
+"""
+Logging setup for ReMo
+- LOG_FORMAT=text (default): plain lines, as logging.basicConfig produced
+- LOG_FORMAT=json: one JSON object per line (structured)
+- LOG_ASYNC: request threads only enqueue records; a background listener
+  thread formats and writes them (defaults on with LOG_FORMAT=json)
+- LOG_INFO_RATE_PER_SECOND: per call site cap on INFO/DEBUG lines; WARNING
+  and above always pass untouched (defaults to 20 with LOG_FORMAT=json)
+"""
+from typing import Dict, Optional, Tuple
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true" if LOG_FORMAT == "json" else "false").lower() in ("1", "true", "yes")
+LOG_INFO_RATE_PER_SECOND = float(os.getenv("LOG_INFO_RATE_PER_SECOND", "20" if LOG_FORMAT == "json" else "0"))
+
+# Bound on queued records; beyond it INFO records are dropped, never errors
+LOG_QUEUE_SIZE = 10000
+
+TEXT_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON line (ts, level, logger, message, exception)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class InfoRateLimitFilter(logging.Filter):
+    """
+    Lets at most rate_per_second INFO/DEBUG records through per call site
+    (pathname, lineno) each second. The first record after a throttled second
+    carries the number dropped as record.suppressed. WARNING+ always passes.
+    """
+
+    def __init__(self, rate_per_second: float):
+        super().__init__()
+        self.rate_per_second = rate_per_second
+        self._windows: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate_per_second <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        second = int(record.created)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window[0] != second:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [second, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.rate_per_second:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records without formatting them (the stdlib QueueHandler formats
+    in the caller's thread); formatting happens in the listener thread.
+    A full queue drops INFO records but blocks for WARNING and above.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging() -> None:
+    """Install the root handler according to the LOG_* settings (no-op if one exists)"""
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        # Already configured (like logging.basicConfig, never stack handlers)
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+    if LOG_ASYNC:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(LOG_QUEUE_SIZE)
+        handler: logging.Handler = DeferredQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        handler = stream_handler
+    if LOG_INFO_RATE_PER_SECOND > 0:
+        handler.addFilter(InfoRateLimitFilter(LOG_INFO_RATE_PER_SECOND))
+
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(handler)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
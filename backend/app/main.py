@@ -1,25 +1,43 @@
 """
 ReMo Backend - FastAPI Application Entry Point
 """
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import FastAPI, Request, Response, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, field_validator
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+import pydantic_core
+from sqlalchemy import func, tuple_, update
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import gzip
+import hashlib
+import json
 import os
+import time
 import uuid
 import logging
 
 # Configure logging FIRST before any logger calls
-logging.basicConfig(level=logging.INFO)
+from app.logging_config import configure_logging
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Import database and models
-from app.db import get_db, check_db_connection, engine, get_db_info
-from app.models import Video, Comment, Base
+from app.db import get_db, get_primary_read_db, get_read_db, get_write_db, engine, read_engine, get_db_info, ReadSessionLocal, DATABASE_REPLICA_URL
+from app.models import Video, Comment, CommentHistogramBucket, Base
+from app.realtime import comment_hub, stream_events
+from app.cache import comment_cache
+from app.auth import get_google_verifier
+from app.comment_writes import bump_comment_version, get_comment_write_buffer, insert_comments
+from app.health import db_health_monitor, pool_stats, probe_database
+from app.read_routing import client_is_sticky, mark_recent_write
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.histogram import HISTOGRAM_RESOLUTIONS, adjust_comment_histogram, get_comment_histogram, rebuild_comment_histograms
+from app.video_stats import record_comment_deleted, reconcile_video_stats
+from app.search import SearchPosition, ensure_search_index, search_comments, search_terms
 
 # Import DB_SCHEME after db module is loaded
 try:
@@ -31,55 +49,124 @@ except ImportError:
 logger.info(f"[STARTUP] Database URL scheme: {DB_SCHEME}")
 logger.info(f"[STARTUP] DATABASE_URL set: {'Yes' if os.getenv('DATABASE_URL') else 'No (using default SQLite)'}")
 
-# Create tables on startup (idempotent - safe to run multiple times)
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("[STARTUP] Database tables created/verified")
-    
-    # Log which tables exist
-    from sqlalchemy import inspect, text
-    inspector = inspect(engine)
-    tables = inspector.get_table_names()
-    logger.info(f"[STARTUP] Existing tables: {', '.join(tables) if tables else 'none'}")
-    
-    # Check if comments table exists and add deleted_at column if missing (migration helper)
-    if "comments" in tables:
-        db = next(get_db())
-        try:
-            # Check if deleted_at column exists
-            if DB_SCHEME == "sqlite":
-                result = db.execute(text("PRAGMA table_info(comments)"))
-                columns = [row[1] for row in result.fetchall()]
-            else:
-                # PostgreSQL
-                result = db.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name='comments' AND column_name='deleted_at'
-                """))
-                columns = [row[0] for row in result.fetchall()]
-            
-            if 'deleted_at' not in columns:
-                logger.info("[STARTUP] Adding deleted_at column to comments table (migration)")
+# Skip startup schema work when the schema is managed by Alembic (the Dockerfile
+# runs `alembic upgrade head` before starting uvicorn)
+FAST_START = os.getenv("FAST_START", "false").lower() in ("1", "true", "yes")
+
+
+def prepare_database() -> None:
+    """
+    Create tables and apply small in-place column migrations for databases not
+    managed by Alembic (idempotent - safe to run multiple times).
+    Runs from the app startup hook rather than at import time.
+    """
+    try:
+        Base.metadata.create_all(bind=engine)
+        logger.info("[STARTUP] Database tables created/verified")
+        
+        # Log which tables exist
+        from sqlalchemy import inspect, text
+        inspector = inspect(engine)
+        tables = inspector.get_table_names()
+        logger.info(f"[STARTUP] Existing tables: {', '.join(tables) if tables else 'none'}")
+        
+        # Check if comments table exists and add deleted_at column if missing (migration helper)
+        if "comments" in tables:
+            db = next(get_db())
+            try:
+                # Check if deleted_at column exists
                 if DB_SCHEME == "sqlite":
-                    db.execute(text("ALTER TABLE comments ADD COLUMN deleted_at DATETIME"))
+                    result = db.execute(text("PRAGMA table_info(comments)"))
+                    columns = [row[1] for row in result.fetchall()]
                 else:
-                    db.execute(text("ALTER TABLE comments ADD COLUMN deleted_at TIMESTAMP"))
+                    # PostgreSQL
+                    result = db.execute(text("""
+                        SELECT column_name 
+                        FROM information_schema.columns 
+                        WHERE table_name='comments'
+                    """))
+                    columns = [row[0] for row in result.fetchall()]
+                
+                if 'deleted_at' not in columns:
+                    logger.info("[STARTUP] Adding deleted_at column to comments table (migration)")
+                    if DB_SCHEME == "sqlite":
+                        db.execute(text("ALTER TABLE comments ADD COLUMN deleted_at DATETIME"))
+                    else:
+                        db.execute(text("ALTER TABLE comments ADD COLUMN deleted_at TIMESTAMP"))
+                    db.commit()
+                    logger.info("[STARTUP] Successfully added deleted_at column")
+                
+                # Delta-sync change order; existing rows keep 0 (before any watermark)
+                if 'change_version' not in columns:
+                    logger.info("[STARTUP] Adding change_version column to comments table (migration)")
+                    db.execute(text("ALTER TABLE comments ADD COLUMN change_version INTEGER NOT NULL DEFAULT 0"))
+                    db.execute(text(
+                        "CREATE INDEX IF NOT EXISTS ix_comments_video_changes ON comments (video_id, change_version, id)"
+                    ))
+                    db.commit()
+                    logger.info("[STARTUP] Successfully added change_version column")
+                
+                # Same for videos.comment_version (per-video ETag version counter)
+                if DB_SCHEME == "sqlite":
+                    result = db.execute(text("PRAGMA table_info(videos)"))
+                    video_columns = [row[1] for row in result.fetchall()]
+                else:
+                    result = db.execute(text("""
+                        SELECT column_name 
+                        FROM information_schema.columns 
+                        WHERE table_name='videos'
+                    """))
+                    video_columns = [row[0] for row in result.fetchall()]
+                
+                if 'comment_version' not in video_columns:
+                    logger.info("[STARTUP] Adding comment_version column to videos table (migration)")
+                    db.execute(text("ALTER TABLE videos ADD COLUMN comment_version INTEGER NOT NULL DEFAULT 0"))
+                    db.commit()
+                    logger.info("[STARTUP] Successfully added comment_version column")
+                
+                # Denormalized comment stats (see app.video_stats); backfilled below
+                added_stats_columns = False
+                for column, ddl in (
+                    ("comment_count", "INTEGER NOT NULL DEFAULT 0"),
+                    ("author_count", "INTEGER NOT NULL DEFAULT 0"),
+                    ("last_activity_at", "DATETIME" if DB_SCHEME == "sqlite" else "TIMESTAMP"),
+                ):
+                    if column not in video_columns:
+                        logger.info(f"[STARTUP] Adding {column} column to videos table (migration)")
+                        db.execute(text(f"ALTER TABLE videos ADD COLUMN {column} {ddl}"))
+                        added_stats_columns = True
+                if added_stats_columns:
+                    db.commit()
+                    reconcile_video_stats(db)
+                # Catalog ETag lookup (create_all only indexes tables it creates)
+                db.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_videos_last_activity_at ON videos (last_activity_at)"
+                ))
                 db.commit()
-                logger.info("[STARTUP] Successfully added deleted_at column")
-            
-            comment_count = db.query(Comment).count()
-            logger.info(f"[STARTUP] Total comments in database: {comment_count}")
-        except Exception as migration_error:
-            logger.warning(f"[STARTUP] Migration check failed (may already be applied): {str(migration_error)}")
-            db.rollback()
-        finally:
-            db.close()
-except Exception as e:
-    logger.error(f"[STARTUP] Failed to create database tables: {str(e)}")
-    # Don't crash on startup if DB is temporarily unavailable
-    # This allows the app to start and return helpful errors on API calls
+                
+                # Backfill the density histogram if its table was just created by create_all
+                has_comments = db.query(Comment.id).first() is not None
+                if has_comments and db.query(CommentHistogramBucket.video_id).first() is None:
+                    logger.info("[STARTUP] Backfilling comment histogram buckets")
+                    rebuild_comment_histograms(db)
+                
+                # Full-text search index (FTS5 table + triggers / GIN index)
+                ensure_search_index(db)
+            except Exception as migration_error:
+                logger.warning(f"[STARTUP] Migration check failed (may already be applied): {str(migration_error)}")
+                db.rollback()
+            finally:
+                db.close()
+    except Exception as e:
+        logger.error(f"[STARTUP] Failed to create database tables: {str(e)}", exc_info=True)
+        # Don't crash on startup if DB is temporarily unavailable
+        # This allows the app to start and return helpful errors on API calls
 
+
+# Routes that touch the database (or make blocking network calls) are declared
+# with plain `def` so FastAPI runs them in its worker threadpool. The SQLAlchemy
+# Session is synchronous; calling it from an `async def` route would block the
+# event loop and stall every other request on the worker.
 app = FastAPI(
     title="ReMo API",
     description="Backend API for ReMo - Real-time Media Moments",
@@ -96,6 +183,9 @@ allowed_origins = [origin.strip() for origin in allowed_origins_raw.split(",") i
 # Log allowed origins (without sensitive data)
 logger.info(f"[CORS] Allowed origins: {', '.join(allowed_origins)}")
 
+# Request timing for /metrics (added first so it sits inside CORS)
+app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
@@ -106,6 +196,26 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def startup_prepare_database():
+    if FAST_START:
+        logger.info("[STARTUP] FAST_START set - skipping schema checks (schema managed by Alembic)")
+        return
+    started = time.perf_counter()
+    prepare_database()
+    logger.info(f"[STARTUP] Schema checks finished in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+@app.on_event("startup")
+def startup_health_monitor():
+    db_health_monitor.start()
+
+
+@app.on_event("shutdown")
+def shutdown_health_monitor():
+    db_health_monitor.stop()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -114,19 +224,49 @@ async def root():
 
 @app.get("/health")
 async def health():
-    """Health check endpoint - CORS middleware handles OPTIONS automatically"""
-    db_healthy = check_db_connection()
-    return {
-        "status": "healthy",
-        "database": "connected" if db_healthy else "disconnected"
+    """
+    Shallow health check for load-balancer probes - CORS middleware handles OPTIONS automatically.
+    Served from the background monitor's cached result; never opens a DB connection.
+    """
+    return {"status": "healthy", **db_health_monitor.snapshot()}
+
+
+@app.get("/health/deep")
+def health_deep():
+    """
+    Deep health check: probes the database now and reports probe latency and
+    connection-pool checkout stats. Returns 503 if the database is unreachable.
+    A replica, if configured, is probed too; it failing only degrades the status.
+    """
+    probe = db_health_monitor.check_now()
+    body = {
+        "status": "healthy" if probe["ok"] else "unhealthy",
+        "database": "connected" if probe["ok"] else "disconnected",
+        "probe_latency_ms": probe["latency_ms"],
+        "pool": pool_stats(engine),
     }
+    if probe["error"]:
+        body["error"] = probe["error"]
+    if DATABASE_REPLICA_URL:
+        replica_probe = probe_database(read_engine)
+        body["replica"] = {
+            "database": "connected" if replica_probe["ok"] else "disconnected",
+            "probe_latency_ms": replica_probe["latency_ms"],
+            "pool": pool_stats(read_engine),
+        }
+        if replica_probe["error"]:
+            body["replica"]["error"] = replica_probe["error"]
+            if probe["ok"]:
+                body["status"] = "degraded"
+    return JSONResponse(content=body, status_code=200 if probe["ok"] else 503)
 
 
 @app.get("/debug/db")
-async def debug_db():
+def debug_db():
     """
     Debug endpoint to verify database configuration and comment storage.
-    Returns database scheme, host, tables, and comment count.
+    Returns database scheme, host, tables, and live comment count (summed from
+    the per-video counters, so no comments table scan).
     """
     try:
         db_info = get_db_info()
@@ -140,13 +280,32 @@ async def debug_db():
             "all_tables_present": all(table in db_info.get("tables_present", []) for table in ["videos", "comments"])
         }
     except Exception as e:
-        logger.error(f"[DEBUG] Error in /debug/db: {str(e)}")
+        logger.error(f"[DEBUG] Error in /debug/db: {str(e)}", exc_info=True)
         return {
             "error": str(e),
             "db_url_scheme": DB_SCHEME if 'DB_SCHEME' in globals() else "unknown"
         }
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus metrics (text exposition format): per-route request latency,
+    DB statement timing per route, pool checkout wait/in-use/overflow and
+    rate-limit rejections.
+    """
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/debug/cache")
+def debug_cache():
+    """
+    Debug endpoint for sizing the comment page cache.
+    Returns hit/miss/eviction counters and current memory use.
+    """
+    return {"comment_cache": comment_cache.stats()}
+
+
 # Pydantic models for request/response
 class VideoResponse(BaseModel):
     id: str
@@ -159,6 +318,9 @@ class VideoResponse(BaseModel):
     thumbnail_url: Optional[str] = None
     duration_seconds: Optional[int] = None
     created_at: datetime
+    comment_count: int = 0
+    author_count: int = 0
+    last_activity_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -188,68 +350,485 @@ class CommentResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class CommentSearchResult(CommentResponse):
+    rank: float  # relevance, higher is better (only comparable within one query)
+
+# Max comments accepted by one batch request
+MAX_BATCH_COMMENTS = 500
+
+class CommentBatchCreate(BaseModel):
+    # Items are validated one by one so a bad item does not reject the whole batch
+    comments: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_COMMENTS)
+
+class CommentBatchItemResult(BaseModel):
+    index: int
+    status: str  # 'created' | 'invalid' | 'rate_limited'
+    comment: Optional[CommentResponse] = None
+    error: Optional[str] = None
+
+class CommentBatchResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[CommentBatchItemResult]
+
+class CommentTombstone(BaseModel):
+    id: str
+    video_id: str
+    deleted_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class CommentChangesResponse(BaseModel):
+    comments: List[CommentResponse]
+    deleted: List[CommentTombstone]
+    watermark: str
+    has_more: bool
+
+
+# Conditional GET helpers
+# ETags are derived from cheap version data (a row count, a timestamp, a
+# counter column) so an unchanged resource is answered with 304 Not Modified
+# before the full query runs or anything is serialized.
+def _make_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == bare for tag in candidates)
+
+
+def _not_modified(etag: str, vary: Optional[str] = None) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
+
+
+def _catalog_etag(db: Session) -> str:
+    """
+    Catalog version for Video rows: changes when videos are added or removed
+    (count, newest created_at) or when any video's comment stats change (every
+    comment insert/soft delete sets last_activity_at). The maxima are index
+    lookups, so no write has to touch a shared row to keep this current.
+    """
+    # One subquery per aggregate: a lone max() is answered from its index
+    video_count, newest, last_activity = db.query(
+        db.query(func.count(Video.id)).scalar_subquery(),
+        db.query(func.max(Video.created_at)).scalar_subquery(),
+        db.query(func.max(Video.last_activity_at)).scalar_subquery(),
+    ).one()
+    return _make_etag("catalog", video_count, newest, last_activity)
+
+
+def _video_etag(video_id: str, created_at: datetime, comment_version: int) -> str:
+    return _make_etag("video", video_id, created_at, comment_version)
+
+
+MAX_VIDEO_PAGE_SIZE = 500
+
+_video_list_adapter = TypeAdapter(List[VideoResponse])
+_video_fields_adapter = TypeAdapter(List[Dict[str, Any]])
+
+
+def _encode_video_cursor(created_at: datetime, video_id: str) -> str:
+    """Encode the keyset position of a catalog row as an opaque cursor string"""
+    raw = json.dumps([created_at.isoformat(), video_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_video_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by _encode_video_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, video_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(video_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+
+def _parse_video_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated VideoResponse field list (id is always included).
+    Returns None for the full representation; raises ValueError on unknown fields.
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in VideoResponse.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown video fields: {', '.join(unknown)}")
+    return ["id"] + [name for name in dict.fromkeys(requested) if name != "id"]
+
 
 # Video endpoints
 @app.get("/videos", response_model=List[VideoResponse])
-async def get_videos(db: Session = Depends(get_db)):
-    """Get all videos"""
-    videos = db.query(Video).order_by(Video.created_at.desc()).all()
-    return videos
+def get_videos(
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get videos, newest first (supports If-None-Match).
+    - Keyset pagination on (created_at, id): pass limit (1-500), then the
+      X-Next-Cursor header of the previous page as cursor.
+      Without limit or cursor the whole catalog is returned, as before.
+    - fields: comma-separated columns to return, e.g. fields=id,title,thumbnail_url
+      (id is always included); only those columns are read from the database
+    """
+    try:
+        selected = _parse_video_fields(fields)
+        after = _decode_video_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if limit is not None and (limit < 1 or limit > MAX_VIDEO_PAGE_SIZE):
+        limit = 100
+    if after and limit is None:
+        limit = 100
+    
+    etag = _make_etag(_catalog_etag(db), limit, cursor, ",".join(selected or []))
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    
+    if selected is None:
+        query = db.query(Video)
+    else:
+        # created_at is always read so the page's cursor can be built
+        columns = dict.fromkeys(selected + ["created_at"])
+        query = db.query(*[getattr(Video, name) for name in columns])
+    if after:
+        # Seek past the last row of the previous page (descending order)
+        query = query.filter(tuple_(Video.created_at, Video.id) < tuple_(*after))
+    query = query.order_by(Video.created_at.desc(), Video.id.desc())
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    rows = query.limit(limit + 1).all() if limit is not None else query.all()
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = _encode_video_cursor(rows[-1].created_at, rows[-1].id)
+    
+    if selected is None:
+        body = _video_list_adapter.dump_json(_video_list_adapter.validate_python(rows, from_attributes=True))
+    else:
+        body = _video_fields_adapter.dump_json([
+            {name: getattr(row, name) for name in selected} for row in rows
+        ])
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/videos/{video_id}", response_model=VideoResponse)
-async def get_video(video_id: str, db: Session = Depends(get_db)):
-    """Get a single video by ID"""
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
+def get_video(video_id: str, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """Get a single video by ID (supports If-None-Match)"""
+    version = db.query(Video.created_at, Video.comment_version).filter(Video.id == video_id).first()
+    if not version:
         raise HTTPException(status_code=404, detail="Video not found")
+    etag = _video_etag(video_id, version.created_at, version.comment_version)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    video = db.query(Video).filter(Video.id == video_id).first()
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     return video
 
+_comment_list_adapter = TypeAdapter(List[CommentResponse])
+
+# Opt-in compact format for bulk comment reads (?format=columnar or this Accept type)
+COLUMNAR_MEDIA_TYPE = "application/vnd.remo.columnar+json"
+
+# Columnar bodies at least this large are gzipped when the client accepts it
+COLUMNAR_GZIP_MIN_BYTES = int(os.getenv("COLUMNAR_GZIP_MIN_BYTES", "1024"))
+
+# Comment pages are negotiated on both headers, so every variant (JSON
+# included) must say so or a shared cache could serve one to the other
+COMMENT_PAGE_VARY = "Accept, Accept-Encoding"
+
+
+def _wants_columnar(request: Request, format: Optional[str]) -> bool:
+    if format is not None:
+        if format not in ("json", "columnar"):
+            raise HTTPException(status_code=400, detail="format must be 'json' or 'columnar'")
+        return format == "columnar"
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def _encode_columnar_comments(video_id: str, rows: List[Any], gzip_ok: bool) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Encode comment rows as parallel arrays, skipping per-row model validation.
+    video_id is sent once instead of per row. Serialized with pydantic_core's
+    Rust JSON encoder and gzipped above COLUMNAR_GZIP_MIN_BYTES.
+    """
+    columns = list(zip(*rows)) if rows else [()] * 6
+    ids, timestamps, author_ids, author_names, bodies, created_at = columns
+    body = pydantic_core.to_json({
+        "video_id": video_id,
+        "count": len(rows),
+        "ids": ids,
+        "timestamps": timestamps,
+        "author_ids": author_ids,
+        "author_names": author_names,
+        "bodies": bodies,
+        "created_at": created_at,
+    })
+    headers = {"Content-Type": COLUMNAR_MEDIA_TYPE}
+    if gzip_ok and len(body) >= COLUMNAR_GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def _encode_comment_cursor(comment: Comment) -> str:
+    """Encode the keyset position of a comment as an opaque cursor string"""
+    key = [comment.timestamp_seconds, comment.created_at.isoformat(), comment.id]
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_comment_cursor(cursor: str) -> Tuple[float, datetime, str]:
+    """
+    Decode a cursor produced by _encode_comment_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp_seconds, created_at, comment_id = json.loads(raw)
+        return float(timestamp_seconds), datetime.fromisoformat(created_at), str(comment_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+
+def live_comments_page_query(
+    query,
+    video_id: str,
+    from_ts: Optional[float] = None,
+    to_ts: Optional[float] = None,
+    after: Optional[Tuple[float, datetime, str]] = None
+):
+    """
+    Filters and order of the get_comments read path, served by
+    ix_comments_video_live_order with no sort (tests/test_query_plans.py)
+    """
+    query = query.filter(
+        Comment.video_id == video_id,
+        Comment.deleted_at.is_(None)  # Only return non-deleted comments
+    )
+    if from_ts is not None:
+        query = query.filter(Comment.timestamp_seconds >= from_ts)
+    if to_ts is not None:
+        query = query.filter(Comment.timestamp_seconds <= to_ts)
+    if after:
+        # Seek past the last row of the previous page instead of skipping rows
+        query = query.filter(
+            tuple_(Comment.timestamp_seconds, Comment.created_at, Comment.id) > tuple_(*after)
+        )
+    return query.order_by(
+        Comment.timestamp_seconds.asc(),
+        Comment.created_at.asc(),
+        Comment.id.asc()
+    )
+
+
 @app.get("/videos/{video_id}/comments", response_model=List[CommentResponse])
-async def get_comments(
+def get_comments(
     video_id: str,
+    request: Request,
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db)
+    from_ts: Optional[float] = None,
+    to_ts: Optional[float] = None,
+    cursor: Optional[str] = None,
+    format: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """
     Get comments for a video with pagination.
     - Filters out soft-deleted comments (deleted_at IS NULL)
-    - Ordered by timestamp_seconds ASC, then created_at ASC
-    - Supports limit and offset for pagination
+    - Ordered by timestamp_seconds ASC, then created_at ASC (id breaks ties)
+    - Optional from_ts/to_ts restrict results to a playback time window (inclusive);
+      400 if from_ts > to_ts
+    - Keyset pagination: pass the X-Next-Cursor header of the previous page as cursor.
+      offset is still accepted for older clients but is ignored when cursor is set.
+    - Serialized pages are served from comment_cache until a write to the video
+      (except to clients within their read-your-writes window, see app.read_routing)
+    - Supports If-None-Match; the ETag follows the video's comment_version
+    - format=columnar (or Accept: application/vnd.remo.columnar+json) returns
+      parallel arrays instead of one object per comment, gzipped when large
     """
     try:
-        # Verify video exists
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
+        columnar = _wants_columnar(request, format)
+        gzip_ok = columnar and _accepts_gzip(request)
         
         # Validate pagination parameters
         if limit < 1 or limit > 500:
             limit = 100
         if offset < 0:
             offset = 0
+        if from_ts is not None and to_ts is not None and from_ts > to_ts:
+            raise HTTPException(status_code=400, detail="from_ts must not be greater than to_ts")
+        
+        after = None
+        if cursor:
+            try:
+                after = _decode_comment_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            offset = 0
+        
+        page_params = (limit, offset, from_ts, to_ts, cursor, "columnar" if columnar else "json")
+        cache_key = page_params + (gzip_ok,)
+        # A client that just wrote skips the cache: its write only invalidated
+        # the cache of the instance that handled it
+        cached = None if client_is_sticky(request) else comment_cache.get(video_id, cache_key)
+        if cached is not None:
+            if _etag_matches(request, cached.headers["ETag"]):
+                return _not_modified(cached.headers["ETag"], COMMENT_PAGE_VARY)
+            return Response(content=cached.body, media_type="application/json", headers=cached.headers)
+        generation = comment_cache.generation(video_id)
+        
+        # Verify video exists and read its comment version
+        comment_version = db.query(Video.comment_version).filter(Video.id == video_id).scalar()
+        if comment_version is None:
+            raise HTTPException(status_code=404, detail="Video not found")
+        
+        etag = _make_etag("comments", video_id, comment_version, *page_params)
+        if _etag_matches(request, etag):
+            return _not_modified(etag, COMMENT_PAGE_VARY)
         
         # Get comments ordered by timestamp_seconds ASC, then created_at ASC
         # Filter out soft-deleted comments (deleted_at IS NULL)
-        logger.info(f"[DB] Querying comments for video_id={video_id} (limit={limit}, offset={offset})")
-        comments = db.query(Comment).filter(
-            Comment.video_id == video_id,
-            Comment.deleted_at.is_(None)  # Only return non-deleted comments
-        ).order_by(
-            Comment.timestamp_seconds.asc(),
-            Comment.created_at.asc()
-        ).offset(offset).limit(limit).all()
-        
-        logger.info(f"[DB] Found {len(comments)} comments for video_id={video_id}")
-        return comments
+        logger.info(
+            "[DB] Querying comments for video_id=%s (limit=%s, offset=%s, from_ts=%s, to_ts=%s, cursor=%s)",
+            video_id, limit, offset, from_ts, to_ts, "yes" if after else "no"
+        )
+        if columnar:
+            # Plain column tuples: no ORM identity map, no model validation
+            query = db.query(
+                Comment.id, Comment.timestamp_seconds, Comment.author_id,
+                Comment.author_name, Comment.body, Comment.created_at
+            )
+        else:
+            query = db.query(Comment)
+        query = live_comments_page_query(query, video_id, from_ts, to_ts, after)
+        if offset:
+            query = query.offset(offset)
+        
+        # Fetch one extra row to learn whether another page exists
+        comments = query.limit(limit + 1).all()
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": COMMENT_PAGE_VARY}
+        if len(comments) > limit:
+            comments = comments[:limit]
+            headers["X-Next-Cursor"] = _encode_comment_cursor(comments[-1])
+        
+        logger.info("[DB] Found %d comments for video_id=%s", len(comments), video_id)
+        if columnar:
+            body, format_headers = _encode_columnar_comments(video_id, comments, gzip_ok)
+            headers.update(format_headers)
+        else:
+            body = _comment_list_adapter.dump_json(
+                _comment_list_adapter.validate_python(comments, from_attributes=True)
+            )
+        comment_cache.put(video_id, cache_key, body, headers, generation)
+        return Response(content=body, media_type="application/json", headers=headers)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[BACKEND] Error fetching comments for video {video_id}: {str(e)}")
+        logger.error(f"[BACKEND] Error fetching comments for video {video_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch comments")
 
+def _encode_change_watermark(change_version: int, comment_id: str) -> str:
+    """Encode a delta-sync position (change_version, comment id) as an opaque watermark"""
+    raw = json.dumps([change_version, comment_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_change_watermark(since: str) -> Tuple[int, str]:
+    """Decode a watermark produced by _encode_change_watermark (400 if malformed)"""
+    try:
+        raw = base64.urlsafe_b64decode(since + "=" * (-len(since) % 4))
+        change_version, comment_id = json.loads(raw)
+        if isinstance(change_version, bool) or not isinstance(change_version, int) or not isinstance(comment_id, str):
+            raise ValueError("unexpected watermark contents")
+        return change_version, comment_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid since watermark")
+
+
+@app.get("/videos/{video_id}/comments/changes", response_model=CommentChangesResponse)
+def get_comment_changes(
+    video_id: str,
+    since: Optional[str] = None,
+    limit: int = 500,
+    db: Session = Depends(get_primary_read_db)
+):
+    """
+    Delta sync: comments inserted and soft-deleted after a watermark.
+    - since: watermark from a previous response (omit for an initial full sync)
+    - deleted contains tombstones for comments soft-deleted after the watermark
+    - Pass the returned watermark as since on the next call; if has_more is
+      true, call again immediately to fetch the rest
+    Changes are ordered by the change_version each insert/soft delete took from
+    the video's comment_version. Those are handed out under the video row lock,
+    so a later version never commits before an earlier one and a watermark
+    never skips a change. Always reads the primary, so a sync right after a
+    write includes it.
+    """
+    try:
+        video = db.query(Video.id).filter(Video.id == video_id).first()
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        
+        if limit < 1 or limit > 500:
+            limit = 500
+        
+        query = db.query(Comment).filter(Comment.video_id == video_id)
+        if since:
+            after = _decode_change_watermark(since)
+            query = query.filter(tuple_(Comment.change_version, Comment.id) > tuple_(*after))
+        else:
+            # Tombstones only matter to clients that already hold a copy
+            query = query.filter(Comment.deleted_at.is_(None))
+        
+        logger.info(f"[DB] Querying comment changes for video_id={video_id} (since={since}, limit={limit})")
+        # Served by ix_comments_video_changes (no sort)
+        changes = query.order_by(Comment.change_version.asc(), Comment.id.asc()).limit(limit + 1).all()
+        
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if changes:
+            watermark = _encode_change_watermark(changes[-1].change_version, changes[-1].id)
+        else:
+            watermark = since or _encode_change_watermark(0, "")
+        
+        return CommentChangesResponse(
+            comments=[CommentResponse.model_validate(c) for c in changes if c.deleted_at is None],
+            deleted=[CommentTombstone.model_validate(c) for c in changes if c.deleted_at is not None],
+            watermark=watermark,
+            has_more=has_more
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[BACKEND] Error fetching comment changes for video {video_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to fetch comment changes")
+
 @app.post("/videos/{video_id}/comments", response_model=CommentResponse)
-async def create_comment(video_id: str, comment: CommentCreate, db: Session = Depends(get_db)):
+def create_comment(video_id: str, comment: CommentCreate, response: Response, db: Session = Depends(get_write_db)):
     """
     Create a new comment for a video.
     Validates input, checks rate limits, and persists to database.
@@ -262,10 +841,11 @@ async def create_comment(video_id: str, comment: CommentCreate, db: Session = De
         
         if not is_allowed:
             error_msg = get_rate_limit_error_message(seconds_until_reset)
-            logger.warning(f"[RATE_LIMIT] User {user_id} exceeded rate limit")
+            logger.warning("[RATE_LIMIT] User %s exceeded rate limit", user_id)
             raise HTTPException(
                 status_code=429,
-                detail=error_msg
+                detail=error_msg,
+                headers={"Retry-After": str(seconds_until_reset)}
             )
         
         # Verify video exists
@@ -273,39 +853,135 @@ async def create_comment(video_id: str, comment: CommentCreate, db: Session = De
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
         
-        logger.info(f"[BACKEND] POST /videos/{video_id}/comments - Creating comment: author={comment.author_name}, timestamp={comment.timestamp_seconds}, body={comment.body[:50]}...")
+        # Comment text is not logged (only its length)
+        logger.info(
+            "[BACKEND] POST /videos/%s/comments - Creating comment: author=%s, timestamp=%s, body_length=%d",
+            video_id, comment.author_name, comment.timestamp_seconds, len(comment.body)
+        )
         
         # Create comment and INSERT into database
-        logger.info(f"[DB] Inserting comment into database for video_id={video_id}")
-        db_comment = Comment(
-            video_id=video_id,
-            author_name=comment.author_name,
-            author_id=comment.author_id,
-            timestamp_seconds=comment.timestamp_seconds,
-            body=comment.body,
-            deleted_at=None  # Explicitly set to None for new comments
-        )
-        db.add(db_comment)
-        db.commit()
-        db.refresh(db_comment)
+        row = {
+            "video_id": video_id,
+            "author_name": comment.author_name,
+            "author_id": comment.author_id,
+            "timestamp_seconds": comment.timestamp_seconds,
+            "body": comment.body,
+        }
+        write_buffer = get_comment_write_buffer()
+        if write_buffer is not None:
+            # Group commit: flushed with other concurrent comments in one transaction
+            logger.info("[DB] Queueing comment for group commit for video_id=%s", video_id)
+            db.rollback()  # end this session's read transaction before waiting on the flusher
+            stored = write_buffer.submit(row)
+        else:
+            logger.info("[DB] Inserting comment into database for video_id=%s", video_id)
+            stored = insert_comments(db, [row])[0]
+            db.commit()
+        created = CommentResponse.model_validate(stored)
         
-        logger.info(f"[DB] Comment successfully inserted into database: id={db_comment.id}, video_id={video_id}, created_at={db_comment.created_at}")
-        logger.info(f"[BACKEND] Comment created with ID: {db_comment.id}, created_at: {db_comment.created_at}")
-        return db_comment
+        logger.info("[DB] Comment created: id=%s, video_id=%s, created_at=%s", created.id, video_id, created.created_at)
+        
+        comment_cache.invalidate(video_id)
+        mark_recent_write(response, video_id)
+        
+        # Push to live subscribers of this video
+        comment_hub.publish(video_id, "comment.created", created.model_dump(mode="json"))
+        return created
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"[BACKEND] Error creating comment for video {video_id}: {str(e)}")
+        logger.error(f"[BACKEND] Error creating comment for video {video_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to create comment")
 
 
+@app.post("/videos/{video_id}/comments/batch", response_model=CommentBatchResponse)
+def create_comments_batch(
+    video_id: str,
+    batch: CommentBatchCreate,
+    response: Response,
+    db: Session = Depends(get_write_db)
+):
+    """
+    Create many comments for a video in one transaction (imports, chat replays).
+    - Each item is validated as a CommentCreate and rate limited individually
+    - Accepted items are written with a single bulk INSERT
+    - results has one entry per item, in request order
+    """
+    from app.rate_limit import check_rate_limit, get_rate_limit_error_message
+    
+    try:
+        # Verify video exists
+        video = db.query(Video.id).filter(Video.id == video_id).first()
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found")
+        
+        results: List[CommentBatchItemResult] = []
+        accepted: List[Tuple[int, CommentCreate]] = []
+        for index, item in enumerate(batch.comments):
+            try:
+                comment = CommentCreate.model_validate(item)
+            except ValidationError as e:
+                results.append(CommentBatchItemResult(
+                    index=index,
+                    status="invalid",
+                    error="; ".join(error["msg"] for error in e.errors())
+                ))
+                continue
+            
+            is_allowed, seconds_until_reset = check_rate_limit(comment.author_id or "guest")
+            if not is_allowed:
+                results.append(CommentBatchItemResult(
+                    index=index,
+                    status="rate_limited",
+                    error=get_rate_limit_error_message(seconds_until_reset)
+                ))
+                continue
+            accepted.append((index, comment))
+        
+        if accepted:
+            logger.info(f"[DB] Bulk inserting {len(accepted)} comments for video_id={video_id}")
+            rows = [
+                {
+                    "video_id": video_id,
+                    "author_name": comment.author_name,
+                    "author_id": comment.author_id,
+                    "timestamp_seconds": comment.timestamp_seconds,
+                    "body": comment.body,
+                }
+                for _, comment in accepted
+            ]
+            stored = insert_comments(db, rows)
+            db.commit()
+            
+            comment_cache.invalidate(video_id)
+            mark_recent_write(response, video_id)
+            for (index, _), stored_row in zip(accepted, stored):
+                created = CommentResponse.model_validate(stored_row)
+                results.append(CommentBatchItemResult(index=index, status="created", comment=created))
+                comment_hub.publish(video_id, "comment.created", created.model_dump(mode="json"))
+        
+        results.sort(key=lambda result: result.index)
+        logger.info(f"[BACKEND] Batch for video_id={video_id}: {len(accepted)} created, {len(results) - len(accepted)} rejected")
+        return CommentBatchResponse(
+            created=len(accepted),
+            rejected=len(results) - len(accepted),
+            results=results
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[BACKEND] Error creating comment batch for video {video_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to create comments")
+
+
 @app.delete("/videos/{video_id}/comments/{comment_id}")
-async def delete_comment(
+def delete_comment(
     video_id: str,
     comment_id: str,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """
     Delete a comment.
@@ -348,26 +1024,198 @@ async def delete_comment(
                 detail="You can only delete your own comments"
             )
         
-        # Authorized - soft delete the comment (set deleted_at timestamp)
-        comment.deleted_at = datetime.now(timezone.utc)
+        # Authorized - soft delete the comment (set deleted_at timestamp). The
+        # UPDATE only matches a live comment, so of two concurrent deletes just
+        # one adjusts the counters; the other (or a retry) changes nothing
+        deleted_at = datetime.now(timezone.utc)
+        change_version = bump_comment_version(db, video_id)
+        claimed = db.execute(
+            update(Comment)
+            .where(Comment.id == comment.id, Comment.deleted_at.is_(None))
+            .values(deleted_at=deleted_at, change_version=change_version)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if claimed != 1:
+            db.rollback()
+            from fastapi.responses import Response
+            return Response(status_code=204)
+        adjust_comment_histogram(db, video_id, comment.timestamp_seconds, -1)
+        record_comment_deleted(db, comment, at=deleted_at)
         db.commit()
         db.refresh(comment)
         
         logger.info(f"[BACKEND] Comment {comment_id} soft-deleted by user {user_id_param}")
+        comment_cache.invalidate(video_id)
+        comment_hub.publish(
+            video_id,
+            "comment.deleted",
+            {"id": comment.id, "video_id": video_id, "deleted_at": comment.deleted_at.isoformat()}
+        )
         # Return 204 No Content
         from fastapi.responses import Response
-        return Response(status_code=204)
+        response = Response(status_code=204)
+        mark_recent_write(response, video_id)
+        return response
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"[BACKEND] Error deleting comment {comment_id}: {str(e)}")
+        logger.error(f"[BACKEND] Error deleting comment {comment_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to delete comment")
 
 
+@app.get("/videos/{video_id}/comments/histogram")
+def get_comments_histogram(
+    video_id: str,
+    request: Request,
+    resolution: int = 5,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Comment density for timeline markers: live comment counts per fixed-width
+    time bucket. Only non-empty buckets are returned.
+    - resolution: bucket width in seconds (1, 5 or 30)
+    - Counts are maintained on write, so this never scans the comments table
+    """
+    if resolution not in HISTOGRAM_RESOLUTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"resolution must be one of {', '.join(str(r) for r in HISTOGRAM_RESOLUTIONS)}"
+        )
+    
+    comment_version = db.query(Video.comment_version).filter(Video.id == video_id).scalar()
+    if comment_version is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    etag = _make_etag("histogram", video_id, comment_version, resolution)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    
+    buckets = get_comment_histogram(db, video_id, resolution)
+    return JSONResponse(
+        content={"video_id": video_id, "resolution_seconds": resolution, "buckets": buckets},
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
+MAX_SEARCH_PAGE_SIZE = 100
+
+
+def _encode_search_cursor(position: SearchPosition) -> str:
+    """Encode the keyset position of a search hit as an opaque cursor string"""
+    raw = json.dumps(list(position), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_search_cursor(cursor: str) -> SearchPosition:
+    """
+    Decode a cursor produced by _encode_search_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, tiebreak = json.loads(raw)
+        if not isinstance(tiebreak, (int, str)) or isinstance(tiebreak, bool):
+            raise ValueError("bad tiebreak")
+        return float(score), tiebreak
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+
+@app.get("/comments/search", response_model=List[CommentSearchResult])
+def search_comments_endpoint(
+    q: str,
+    video_id: Optional[str] = None,
+    from_ts: Optional[float] = None,
+    to_ts: Optional[float] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text search over comment bodies, across all videos or within one.
+    - Every word of q must match (English stemming: "goals" finds "goal");
+      quotes and operators are treated as plain text
+    - Ranked by relevance (rank, higher first); soft-deleted comments excluded
+    - Optional video_id and from_ts/to_ts (playback seconds, inclusive) scope
+    - Keyset pagination: pass the X-Next-Cursor header of the previous page as cursor
+    """
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query must contain at least one word")
+    if limit < 1 or limit > MAX_SEARCH_PAGE_SIZE:
+        limit = 20
+    after = None
+    if cursor:
+        try:
+            after = _decode_search_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        if video_id is not None and db.query(Video.id).filter(Video.id == video_id).first() is None:
+            raise HTTPException(status_code=404, detail="Video not found")
+        
+        # Query text is not logged (only its size)
+        logger.info(
+            "[DB] Searching comments (terms=%d, video_id=%s, from_ts=%s, to_ts=%s, cursor=%s)",
+            len(terms), video_id, from_ts, to_ts, "yes" if after else "no"
+        )
+        # Fetch one extra row to learn whether another page exists
+        hits = search_comments(db, terms, video_id, from_ts, to_ts, after, limit + 1)
+        headers = {"Cache-Control": "no-cache"}
+        if len(hits) > limit:
+            hits = hits[:limit]
+            headers["X-Next-Cursor"] = _encode_search_cursor(hits[-1][1])
+        
+        results = [
+            CommentSearchResult(**CommentResponse.model_validate(comment).model_dump(), rank=-position[0])
+            for comment, position in hits
+        ]
+        logger.info("[DB] Search found %d comments", len(results))
+        return JSONResponse(
+            content=[result.model_dump(mode="json") for result in results],
+            headers=headers
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[BACKEND] Error searching comments: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to search comments")
+
+
+def _video_exists(video_id: str) -> bool:
+    """Look up a video with a short-lived session (not held for a stream's lifetime)"""
+    db = ReadSessionLocal()
+    try:
+        return db.query(Video.id).filter(Video.id == video_id).first() is not None
+    finally:
+        db.close()
+
+
+@app.get("/videos/{video_id}/comments/stream")
+async def stream_comments(video_id: str, request: Request):
+    """
+    Live comment feed for a video as Server-Sent Events.
+    Emits comment.created (CommentResponse payload) and comment.deleted
+    ({id, video_id, deleted_at}) events. Clients that fall too far behind are
+    disconnected and should reload comments before resubscribing.
+    """
+    if not await run_in_threadpool(_video_exists, video_id):
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    subscriber = comment_hub.subscribe(video_id)
+    logger.info(f"[REALTIME] Subscriber joined video_id={video_id} (total={comment_hub.subscriber_count(video_id)})")
+    return StreamingResponse(
+        stream_events(subscriber, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # Seed endpoint for development
 @app.post("/seed")
-async def seed_database(db: Session = Depends(get_db)):
+def seed_database(db: Session = Depends(get_write_db)):
     """Seed database with sample videos (only if empty)"""
     existing_count = db.query(Video).count()
     if existing_count > 0:
@@ -451,7 +1299,7 @@ class GoogleAuthRequest(BaseModel):
 
 
 @app.post("/auth/google")
-async def auth_google(request_body: GoogleAuthRequest, request: Request):
+def auth_google(request_body: GoogleAuthRequest, request: Request):
     """
     Authenticate with Google ID token
     Returns access token and user info
@@ -469,11 +1317,7 @@ async def auth_google(request_body: GoogleAuthRequest, request: Request):
             logger.error("[AUTH] GOOGLE_CLIENT_ID not configured")
             raise HTTPException(status_code=500, detail="Google OAuth not configured")
         
-        idinfo = id_token.verify_oauth2_token(
-            request_body.id_token,
-            requests.Request(),
-            CLIENT_ID
-        )
+        idinfo = get_google_verifier().verify(request_body.id_token, CLIENT_ID)
         
         # Extract user information
         user_email = idinfo.get("email")
@@ -506,5 +1350,5 @@ async def auth_google(request_body: GoogleAuthRequest, request: Request):
         logger.warning(f"[AUTH] Invalid Google ID token: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Invalid Google ID token: {str(e)}")
     except Exception as e:
-        logger.error(f"[AUTH] Authentication error: {str(e)}")
+        logger.error(f"[AUTH] Authentication error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Authentication error: {str(e)}")
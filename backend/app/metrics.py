@@ -0,0 +1,311 @@
+"""
+Prometheus metrics for ReMo (text exposition format, served at /metrics)
+- HTTP request counts and latency histograms per route template
+- DB statement timing per route, from SQLAlchemy cursor events
+- Connection pool checkout wait, in-use and overflow
+- Replica vs primary routing of read-only sessions
+- Rate-limit rejections
+
+Recording is lock-light: every thread writes to its own shard of each metric
+without locking, and a scrape merges the shards. The only lock is taken the
+first time a thread touches a metric, and by the scrape itself.
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Label for requests that matched no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+# Label for statements issued outside a request (startup, background threads)
+BACKGROUND_ROUTE = "background"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _ShardedMetric:
+    """
+    Base for counters and histograms: one {labels: row} dict per thread.
+    Rows of threads that have exited are folded into _retired at scrape time.
+    """
+
+    row_size = 1
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[LabelValues, list]]] = []
+        self._retired: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def _row(self, labels: LabelValues) -> list:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        row = shard.get(labels)
+        if row is None:
+            row = shard[labels] = [0] * self.row_size
+        return row
+
+    def _merged(self) -> Dict[LabelValues, list]:
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge_into(self._retired, dict(shard))
+            self._shards = live
+            merged: Dict[LabelValues, list] = {}
+            self._merge_into(merged, self._retired)
+            for _, shard in live:
+                # dict() copies atomically under the GIL while the owner keeps writing
+                self._merge_into(merged, dict(shard))
+        return merged
+
+    @staticmethod
+    def _merge_into(target: Dict[LabelValues, list], source: Dict[LabelValues, list]) -> None:
+        for labels, row in source.items():
+            total = target.get(labels)
+            if total is None:
+                target[labels] = list(row)
+            else:
+                for i, value in enumerate(row):
+                    total[i] += value
+
+
+class Counter(_ShardedMetric):
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._row(labels)[0] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, row in sorted(self._merged().items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(row[0])}")
+        return lines
+
+
+class Histogram(_ShardedMetric):
+    """Row layout: one count per bucket (last one is +Inf), then sum"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+        self.row_size = len(self.buckets) + 2
+
+    def observe(self, value: float, *labels: str) -> None:
+        row = self._row(labels)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bounds = self.buckets + (float("inf"),)
+        for labels, row in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, row):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(row[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Values read from callbacks at scrape time, one callback per label set"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._children: Dict[LabelValues, Callable[[], Optional[float]]] = {}
+
+    def set_function(self, read: Callable[[], Optional[float]], *labels: str) -> None:
+        self._children[labels] = read
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for labels, read in sorted(self._children.items()):
+            value = read()
+            if value is not None:
+                lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines if len(lines) > 2 else []
+
+
+http_requests = Counter(
+    "remo_http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+http_latency = Histogram(
+    "remo_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+db_statements = Histogram(
+    "remo_db_statement_duration_seconds", "DB statement execution time by route", ("method", "route"), DB_BUCKETS
+)
+db_checkout_wait = Histogram(
+    "remo_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection", ("pool",), DB_BUCKETS
+)
+db_pool_size = Gauge("remo_db_pool_size", "Configured pool size", ("pool",))
+db_pool_checked_out = Gauge("remo_db_pool_checked_out", "Connections currently checked out (in use)", ("pool",))
+db_pool_overflow = Gauge(
+    "remo_db_pool_overflow", "Connections open beyond pool_size (negative: unused capacity)", ("pool",)
+)
+db_read_routing = Counter(
+    "remo_db_read_routing_total", "Read-only route sessions by target when a replica is configured", ("target",)
+)
+rate_limit_rejections = Counter(
+    "remo_rate_limit_rejections_total", "Comment writes rejected by the rate limiter"
+)
+
+_registry: List = [
+    http_requests, http_latency, db_statements, db_checkout_wait,
+    db_pool_size, db_pool_checked_out, db_pool_overflow, db_read_routing, rate_limit_rejections,
+]
+
+
+def register(metric) -> None:
+    _registry.append(metric)
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# The ASGI scope of the request being served (propagates into threadpool routes)
+_current_scope: ContextVar[Optional[dict]] = ContextVar("remo_metrics_scope", default=None)
+_route_paths: Dict[Callable, str] = {}
+
+
+def _route_label(scope: Optional[dict]) -> str:
+    if scope is None:
+        return BACKGROUND_ROUTE
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    path = _route_paths.get(endpoint)
+    if path is None:
+        # Rebuilt on first use and whenever a new endpoint shows up
+        app = scope.get("app")
+        for route in getattr(app, "routes", ()):
+            route_endpoint = getattr(route, "endpoint", None)
+            if route_endpoint is not None:
+                _route_paths[route_endpoint] = route.path
+        path = _route_paths.get(endpoint, UNMATCHED_ROUTE)
+    return path
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each HTTP request under its route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        token = _current_scope.set(scope)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Streaming routes (SSE) are timed until the stream ends
+            elapsed = time.perf_counter() - started
+            _current_scope.reset(token)
+            route = _route_label(scope)
+            http_latency.observe(elapsed, scope["method"], route)
+            http_requests.inc(scope["method"], route, str(status[0]))
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    pool_label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_checkout_wait.observe(time.perf_counter() - started, self.pool_label)
+
+
+def timed_pool_class(label: str) -> type:
+    """TimedQueuePool subclass reporting under pool=label (survives pool.recreate())"""
+    return type(f"TimedQueuePool_{label}", (TimedQueuePool,), {"pool_label": label})
+
+
+def instrument_engine(engine: Engine, pool_label: str = "primary") -> None:
+    """Time every statement on engine and expose its pool occupancy under pool=pool_label"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("remo_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("remo_query_start")
+        if starts:
+            scope = _current_scope.get()
+            method = scope["method"] if scope is not None else ""
+            db_statements.observe(time.perf_counter() - starts.pop(), method, _route_label(scope))
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("remo_query_start"):
+            conn.info["remo_query_start"].pop()
+
+    def pool_reading(method: str) -> Callable[[], Optional[float]]:
+        # Read from engine.pool on each scrape (dispose() replaces the pool)
+        def read():
+            reader = getattr(engine.pool, method, None)
+            return reader() if callable(reader) else None
+        return read
+
+    db_pool_size.set_function(pool_reading("size"), pool_label)
+    db_pool_checked_out.set_function(pool_reading("checkedout"), pool_label)
+    db_pool_overflow.set_function(pool_reading("overflow"), pool_label)
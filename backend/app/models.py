@@ -1,7 +1,7 @@
 """
 SQLAlchemy models for ReMo database
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -24,9 +24,23 @@ class Video(Base):
     thumbnail_url = Column(String, nullable=True)
     duration_seconds = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    comment_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on comment insert/soft delete (ETags)
+    # Denormalized comment stats, maintained by app.video_stats
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")  # Live (not deleted) comments
+    author_count = Column(Integer, nullable=False, default=0, server_default="0")  # Distinct authors of live comments
+    last_activity_at = Column(DateTime, nullable=True)  # Last comment insert/soft delete
     
     # Relationship to comments
     comments = relationship("Comment", back_populates="video", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Catalog keyset pagination: newest first, id breaks ties
+        # (kept in sync with alembic revision 008_videos_catalog_index)
+        Index("ix_videos_created_at_id", "created_at", "id"),
+        # Catalog ETag: max(last_activity_at) is one index lookup
+        # (kept in sync with alembic revision 011_videos_activity_index)
+        Index("ix_videos_last_activity_at", "last_activity_at"),
+    )
 
 
 class Comment(Base):
@@ -41,6 +55,53 @@ class Comment(Base):
     body = Column(Text, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     deleted_at = Column(DateTime, nullable=True)  # Soft delete: set timestamp when deleted
+    # The video's comment_version assigned by the last insert/soft delete of this
+    # row; versions are handed out under the video row lock, so in commit order
+    change_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationship to video
     video = relationship("Video", back_populates="comments")
+    
+    __table_args__ = (
+        # Read path for get_comments: live rows of one video in playback order
+        # (kept in sync with alembic revision 003_comments_read_index)
+        Index(
+            "ix_comments_video_live_order",
+            "video_id", "timestamp_seconds", "created_at", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # Delta sync (get_comment_changes): one video's rows in change order
+        # (kept in sync with alembic revision 010_comment_change_version)
+        Index("ix_comments_video_changes", "video_id", "change_version", "id"),
+    )
+
+
+class CommentHistogramBucket(Base):
+    """Live comment count for one fixed-width time bucket of a video"""
+    __tablename__ = "comment_histogram_buckets"
+    
+    video_id = Column(String, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    resolution_seconds = Column(Integer, primary_key=True)
+    bucket = Column(Integer, primary_key=True)  # floor(timestamp_seconds / resolution_seconds)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class CommentAuthorCount(Base):
+    """Live comments per author on a video (backs videos.author_count)"""
+    __tablename__ = "comment_author_counts"
+    
+    video_id = Column(String, ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    author_key = Column(String, primary_key=True)  # author_id, or 'guest:<author_name>'
+    count = Column(Integer, nullable=False, default=0)
+
+
+class User(Base):
+    """Authenticated user (Google account)"""
+    __tablename__ = "users"
+    
+    id = Column(String, primary_key=True)  # Google 'sub'
+    email = Column(String, nullable=True)
+    name = Column(String, nullable=True)
+    picture = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
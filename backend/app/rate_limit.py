@@ -1,22 +1,211 @@
 """
 Rate limiting middleware for comment creation
 Prevents abuse by limiting comment creation per user
+
+Token bucket per user: each check is O(1), idle users are evicted, and the
+bucket state lives behind a pluggable backend so limits can be shared by all
+worker processes (RATE_LIMIT_BACKEND=sqlite).
 """
 from fastapi import Request, HTTPException
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
-from collections import defaultdict
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+import math
+import os
+import sqlite3
+import threading
+import time
 import logging
 
+from app.metrics import rate_limit_rejections
+
 logger = logging.getLogger(__name__)
 
 # Rate limit configuration
 RATE_LIMIT_WINDOW_SECONDS = 10  # 10 second window
 RATE_LIMIT_MAX_COMMENTS = 5  # Max 5 comments per window
 
-# In-memory store: {user_id: [(timestamp1, timestamp2, ...)]}
-# In production, use Redis or similar distributed cache
-_rate_limit_store: Dict[str, list] = defaultdict(list)
+# Backend selection: 'memory' (per process) or 'sqlite' (shared through a local file)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "./rate_limits.db")
+
+
+def _take_token(
+    tokens: float,
+    updated_at: float,
+    now: float,
+    capacity: int,
+    window_seconds: float
+) -> Tuple[bool, float, float]:
+    """
+    Refill a bucket for the time elapsed and try to take one token.
+    Returns (is_allowed, tokens_left, seconds_until_next_token)
+    """
+    refill_per_second = capacity / window_seconds
+    tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / refill_per_second
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets.
+    acquire() must refill-and-take atomically for its scope (process or host).
+    """
+
+    def __init__(
+        self,
+        capacity: int = RATE_LIMIT_MAX_COMMENTS,
+        window_seconds: float = RATE_LIMIT_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.clock = clock
+
+    @abstractmethod
+    def acquire(self, key: str) -> Tuple[bool, float]:
+        """Take one token for key. Returns (is_allowed, seconds_until_reset)"""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget all buckets"""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process buckets in an OrderedDict kept in last-used order.
+    A bucket idle for a full window has refilled completely, so it is dropped
+    from the front of the dict on later calls; memory tracks active users only.
+    """
+
+    def __init__(self, *args, max_keys: int = 100_000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> Tuple[bool, float]:
+        now = self.clock()
+        with self._lock:
+            self._evict_idle(now)
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            is_allowed, tokens, wait = _take_token(tokens, updated_at, now, self.capacity, self.window_seconds)
+            self._buckets[key] = (tokens, now)
+            return is_allowed, wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict_idle(self, now: float) -> None:
+        # Caller holds the lock; oldest entries are at the front
+        while self._buckets:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if now - updated_at < self.window_seconds and len(self._buckets) < self.max_keys:
+                break
+            del self._buckets[key]
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Buckets in a local SQLite file shared by every worker on the host.
+    Each check is one short BEGIN IMMEDIATE transaction (a primary-key read and
+    an upsert); idle rows are pruned every prune_interval checks.
+    """
+
+    def __init__(self, path: str = RATE_LIMIT_SQLITE_PATH, *args, prune_interval: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self.prune_interval = prune_interval
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated_at ON rate_limit_buckets (updated_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key: str) -> Tuple[bool, float]:
+        conn = self._connect()
+        now = self.clock()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated_at = row if row else (self.capacity, now)
+            is_allowed, tokens, wait = _take_token(tokens, updated_at, now, self.capacity, self.window_seconds)
+            conn.execute(
+                """
+                INSERT INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at
+                """,
+                (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._calls += 1
+        if self._calls % self.prune_interval == 0:
+            self._prune(now)
+        return is_allowed, wait
+
+    def _prune(self, now: float) -> None:
+        try:
+            self._connect().execute(
+                "DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - self.window_seconds,)
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"[RATE_LIMIT] Prune skipped: {e}")
+
+    def reset(self) -> None:
+        self._connect().execute("DELETE FROM rate_limit_buckets")
+
+
+def _create_backend() -> RateLimitBackend:
+    if RATE_LIMIT_BACKEND == "sqlite":
+        logger.info(f"[RATE_LIMIT] Using shared SQLite backend at {RATE_LIMIT_SQLITE_PATH}")
+        return SQLiteRateLimitBackend(RATE_LIMIT_SQLITE_PATH)
+    return InMemoryRateLimitBackend()
+
+
+_backend: Optional[RateLimitBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    """Swap the backend (tests, or a custom shared store)"""
+    global _backend
+    _backend = backend
 
 
 def check_rate_limit(user_id: str) -> Tuple[bool, int]:
@@ -28,26 +217,11 @@ def check_rate_limit(user_id: str) -> Tuple[bool, int]:
         # Guest users: use IP-based rate limiting (simplified - use user_id for now)
         # For production, extract IP from request
         user_id = "guest"
-    
-    now = datetime.now()
-    window_start = now - timedelta(seconds=RATE_LIMIT_WINDOW_SECONDS)
-    
-    # Clean old entries
-    user_timestamps = _rate_limit_store[user_id]
-    user_timestamps[:] = [ts for ts in user_timestamps if ts > window_start]
-    
-    # Check if limit exceeded
-    if len(user_timestamps) >= RATE_LIMIT_MAX_COMMENTS:
-        # Calculate seconds until oldest entry expires
-        if user_timestamps:
-            oldest = min(user_timestamps)
-            seconds_until_reset = (oldest + timedelta(seconds=RATE_LIMIT_WINDOW_SECONDS) - now).total_seconds()
-            return False, max(0, int(seconds_until_reset))
-        return False, RATE_LIMIT_WINDOW_SECONDS
-    
-    # Record this request
-    user_timestamps.append(now)
-    return True, 0
+
+    is_allowed, seconds_until_reset = get_rate_limit_backend().acquire(user_id)
+    if not is_allowed:
+        rate_limit_rejections.inc()
+    return is_allowed, math.ceil(seconds_until_reset)
 
 
 def get_rate_limit_error_message(seconds_until_reset: int) -> str:
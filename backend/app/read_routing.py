@@ -0,0 +1,105 @@
+"""
+Read-your-writes stickiness for read-replica routing
+When DATABASE_REPLICA_URL is set, read-only routes use the replica. For
+REPLICA_STICKY_SECONDS after a write they go to the primary instead, so a
+comment never seems to vanish while the replica catches up:
+- per client: write responses carry an X-Read-Primary-Until header naming the
+  deadline, which clients echo on later requests (works cross-origin and
+  across app instances); a cookie with the same deadline covers same-origin
+  clients that do not echo it
+- per video: this process remembers which videos it just wrote to, so it
+  also never fills the comment cache from a replica that is behind
+Sticky clients also skip the comment page cache: another instance's cache is
+not invalidated by their write. Deadlines further ahead than one window (plus
+clock skew between instances) are ignored, so a client cannot pin itself to
+the primary by sending a far-future value.
+"""
+from typing import Dict, Optional
+import math
+import os
+import threading
+import time
+
+from fastapi import Request, Response
+
+# Should exceed the replica's worst expected replication lag
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Allowance for clock differences between the instance that set a deadline
+# and the one checking it
+REPLICA_STICKY_CLOCK_SKEW_SECONDS = float(os.getenv("REPLICA_STICKY_CLOCK_SKEW_SECONDS", "2"))
+
+# Wall-clock (epoch seconds) deadline until which this client reads the primary
+STICKY_HEADER = "X-Read-Primary-Until"
+STICKY_COOKIE = "remo_read_primary_until"
+
+# Prune expired per-video entries once the table grows past this size
+RECENT_WRITES_PRUNE_SIZE = 10000
+
+
+class RecentWrites:
+    """Videos written to within the last window_seconds (monotonic deadlines)"""
+
+    def __init__(self, window_seconds: float = REPLICA_STICKY_SECONDS):
+        self.window_seconds = window_seconds
+        self._deadlines: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def note(self, video_id: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._deadlines[video_id] = now + self.window_seconds
+            if len(self._deadlines) > RECENT_WRITES_PRUNE_SIZE:
+                self._deadlines = {key: deadline for key, deadline in self._deadlines.items() if deadline > now}
+
+    def is_recent(self, video_id: str) -> bool:
+        # Lock-free read: a single dict lookup is atomic under the GIL
+        deadline = self._deadlines.get(video_id)
+        return deadline is not None and deadline > time.monotonic()
+
+
+recent_writes = RecentWrites()
+
+
+def mark_recent_write(response: Response, video_id: str) -> None:
+    """Call after a write commits: pins this client and this video to the primary for the window"""
+    if REPLICA_STICKY_SECONDS <= 0:
+        return
+    recent_writes.note(video_id)
+    deadline = f"{time.time() + REPLICA_STICKY_SECONDS:.3f}"
+    response.headers[STICKY_HEADER] = deadline
+    response.set_cookie(
+        STICKY_COOKIE,
+        deadline,
+        max_age=math.ceil(REPLICA_STICKY_SECONDS),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def _parse_deadline(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def client_is_sticky(request: Request) -> bool:
+    """True if this client wrote within the window (echoed header or cookie)"""
+    now = time.time()
+    # No deadline this server sets is further away than one window
+    latest = now + REPLICA_STICKY_SECONDS + REPLICA_STICKY_CLOCK_SKEW_SECONDS
+    for value in (request.headers.get(STICKY_HEADER), request.cookies.get(STICKY_COOKIE)):
+        deadline = _parse_deadline(value)
+        if deadline is not None and now < deadline <= latest:
+            return True
+    return False
+
+
+def should_read_primary(request: Request) -> bool:
+    """True if this read must see recent writes (sticky client or recently written video)"""
+    if client_is_sticky(request):
+        return True
+    video_id = request.path_params.get("video_id")
+    return video_id is not None and recent_writes.is_recent(video_id)
@@ -0,0 +1,141 @@
+"""
+Real-time comment fan-out for ReMo
+In-process broadcast hub that pushes comment events to per-video subscribers
+(served to clients as Server-Sent Events from app.main)
+"""
+import asyncio
+import json
+import os
+import threading
+from typing import AsyncGenerator, Dict, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Max events buffered per subscriber before it is treated as a slow consumer
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))
+
+# Seconds between keep-alive comments on an idle stream
+KEEPALIVE_SECONDS = 15
+
+# Queue sentinel telling a subscriber's stream to end
+_DISCONNECT = None
+
+
+class Subscriber:
+    """A single client stream listening to one video"""
+
+    def __init__(self, video_id: str, loop: asyncio.AbstractEventLoop, max_queue_size: int):
+        self.video_id = video_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.closed = False
+
+    def offer(self, message: Optional[str]) -> None:
+        """
+        Enqueue a message without blocking (must run on the subscriber's loop).
+        A full queue means the client is not keeping up: its backlog is
+        discarded and the stream is closed so it cannot hold up publishers.
+        """
+        if self.closed:
+            return
+        if message is _DISCONNECT:
+            self._close()
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"[REALTIME] Disconnecting slow subscriber for video_id={self.video_id}")
+            self._close()
+
+    def _close(self) -> None:
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_DISCONNECT)
+
+
+class CommentBroadcastHub:
+    """
+    Per-video publish/subscribe hub.
+    publish() is thread-safe and never blocks, so it can be called from the
+    threadpool routes that write comments.
+    """
+
+    def __init__(self, max_queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, video_id: str) -> Subscriber:
+        """Register a subscriber for a video (call from the event loop)"""
+        subscriber = Subscriber(video_id, asyncio.get_running_loop(), self.max_queue_size)
+        with self._lock:
+            self._subscribers.setdefault(video_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber; safe to call more than once"""
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.video_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.video_id]
+
+    def publish(self, video_id: str, event: str, data: Dict) -> int:
+        """
+        Broadcast an event to every subscriber of a video.
+        Returns the number of subscribers the event was handed to.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(video_id, ()))
+        if not subscribers:
+            return 0
+
+        # Format once, share the string across subscribers
+        message = format_sse(event, data)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, message)
+            except RuntimeError:
+                # Subscriber's loop has shut down
+                self.unsubscribe(subscriber)
+        return len(subscribers)
+
+    def subscriber_count(self, video_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(video_id, ()))
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def stream_events(subscriber: Subscriber, is_disconnected) -> AsyncGenerator[str, None]:
+    """
+    Async generator yielding SSE messages for a subscriber until the client
+    goes away or the hub disconnects it.
+    is_disconnected: coroutine function reporting whether the client left
+    """
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            if message is _DISCONNECT:
+                break
+            yield message
+    finally:
+        comment_hub.unsubscribe(subscriber)
+
+
+# Process-wide hub instance
+comment_hub = CommentBroadcastHub()
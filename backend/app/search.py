@@ -0,0 +1,195 @@
+"""
+Full-text search over comment bodies for ReMo
+- SQLite: an FTS5 table (comments_fts) kept in sync by triggers on comments
+- Postgres: a GIN index on to_tsvector('english', body)
+Both stem English words (porter / english config) and require every search
+term to match. Results are ranked (bm25 / ts_rank_cd) and soft-deleted
+comments are filtered out at query time, so soft deletes never touch the index.
+
+Created by migration 009 (Alembic) or ensure_search_index() (create_all setups).
+"""
+from typing import List, Optional, Tuple, Union
+import logging
+import re
+
+from sqlalchemy import Float, Integer, String, cast, column, func, literal_column, table, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import Comment
+
+logger = logging.getLogger(__name__)
+
+SQLITE_FTS_TABLE = "comments_fts"
+POSTGRES_SEARCH_INDEX = "ix_comments_body_search"
+
+# Search terms beyond this are ignored (keeps MATCH / tsquery cost bounded)
+MAX_SEARCH_TERMS = 16
+
+# Extra matches ranked per page on SQLite, to cover soft-deleted ones
+SEARCH_OVERFETCH = 10
+
+# Keyset position of a hit: (score, FTS rowid on SQLite / comment id on Postgres)
+SearchPosition = Tuple[float, Union[int, str]]
+
+# The FTS table keys rows by comment_id rather than mirroring comments.rowid
+# (VACUUM may renumber rowids of tables without an INTEGER PRIMARY KEY).
+# Removing a row scans the FTS table, but comments are only soft-deleted and
+# never edited by the API, so the delete/update triggers only fire for manual
+# maintenance.
+SQLITE_SEARCH_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        body, comment_id UNINDEXED, tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE} (body, comment_id) VALUES (new.body, new.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE comment_id = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF body ON comments BEGIN
+        DELETE FROM {SQLITE_FTS_TABLE} WHERE comment_id = old.id;
+        INSERT INTO {SQLITE_FTS_TABLE} (body, comment_id) VALUES (new.body, new.id);
+    END""",
+)
+SQLITE_SEARCH_BACKFILL = (
+    f"INSERT INTO {SQLITE_FTS_TABLE} (body, comment_id) SELECT body, id FROM comments"
+)
+POSTGRES_SEARCH_DDL = (
+    f"CREATE INDEX IF NOT EXISTS {POSTGRES_SEARCH_INDEX} ON comments "
+    "USING gin (to_tsvector('english', body))"
+)
+
+
+def ensure_search_index(db: Session) -> None:
+    """Create the search index if it is missing (idempotent); backfills a new SQLite index"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text(POSTGRES_SEARCH_DDL))
+        db.commit()
+        return
+    exists = db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SQLITE_FTS_TABLE}
+    ).first()
+    if exists:
+        return
+    logger.info("[SEARCH] Creating comment search index")
+    for statement in SQLITE_SEARCH_DDL:
+        db.execute(text(statement))
+    db.execute(text(SQLITE_SEARCH_BACKFILL))
+    db.commit()
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a user query into plain word terms (no operators are passed through)"""
+    return re.findall(r"\w+", query.lower())[:MAX_SEARCH_TERMS]
+
+
+def search_comments(
+    db: Session,
+    terms: List[str],
+    video_id: Optional[str] = None,
+    from_ts: Optional[float] = None,
+    to_ts: Optional[float] = None,
+    after: Optional[SearchPosition] = None,
+    limit: int = 20
+) -> List[Tuple[Comment, SearchPosition]]:
+    """
+    Live comments matching every term, best first, with their keyset position
+    (score, tiebreak). score is lower-is-better on both backends; pass the
+    position of the last hit of a page as after to get the next page.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, terms, video_id, from_ts, to_ts, after, limit)
+    return _search_sqlite(db, terms, video_id, from_ts, to_ts, after, limit)
+
+
+def _scope(query, video_id: Optional[str], from_ts: Optional[float], to_ts: Optional[float]):
+    query = query.filter(Comment.deleted_at.is_(None))
+    if video_id is not None:
+        query = query.filter(Comment.video_id == video_id)
+    if from_ts is not None:
+        query = query.filter(Comment.timestamp_seconds >= from_ts)
+    if to_ts is not None:
+        query = query.filter(Comment.timestamp_seconds <= to_ts)
+    return query
+
+
+def _search_postgres(db, terms, video_id, from_ts, to_ts, after, limit):
+    # Tiebreak is the comment id
+    tsquery = func.plainto_tsquery(literal_column("'english'"), " ".join(terms))
+    # Must match the indexed expression exactly for the GIN index to be used
+    vector = func.to_tsvector(literal_column("'english'"), Comment.body)
+    score = cast(-func.ts_rank_cd(vector, tsquery), Float)
+    query = _scope(db.query(Comment, score).filter(vector.op("@@")(tsquery)), video_id, from_ts, to_ts)
+    if after is not None:
+        query = query.filter(tuple_(score, Comment.id) > tuple_(*after))
+    rows = query.order_by(score.asc(), Comment.id.asc()).limit(limit).all()
+    return [(comment, (row_score, comment.id)) for comment, row_score in rows]
+
+
+def _ranked_sqlite_sql(after: Optional[SearchPosition], with_comment_id: bool = False) -> Tuple[str, dict]:
+    columns = "rowid AS fts_rowid, comment_id" if with_comment_id else "rowid AS fts_rowid"
+    sql = (
+        f"SELECT {columns}, bm25({SQLITE_FTS_TABLE}) AS score FROM {SQLITE_FTS_TABLE} "
+        f"WHERE {SQLITE_FTS_TABLE} MATCH :match"
+    )
+    if after is None:
+        return sql, {}
+    sql += f" AND (bm25({SQLITE_FTS_TABLE}), rowid) > (:after_score, :after_rowid)"
+    return sql, {"after_score": after[0], "after_rowid": after[1]}
+
+
+def _search_sqlite(db, terms, video_id, from_ts, to_ts, after, limit):
+    """
+    Tiebreak is the FTS rowid, so ranking reads only the FTS index. Unscoped
+    searches rank just enough matches for a page and then look the comments
+    up (ranking more only if some were soft-deleted); scoped searches join
+    every match to comments, since most matches may fall outside the scope.
+    """
+    # Each term quoted as a phrase: FTS5 syntax in user input is never interpreted
+    match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    fts = table(SQLITE_FTS_TABLE, column("rowid", Integer), column("comment_id", String))
+
+    if video_id is not None or from_ts is not None or to_ts is not None:
+        sql, params = _ranked_sqlite_sql(after, with_comment_id=True)
+        ranked = (
+            text(sql).bindparams(match=match, **params)
+            .columns(fts_rowid=Integer, comment_id=String, score=Float)
+            .subquery("ranked")
+        )
+        # Joined on the comments primary key, so SQLite drives the join from
+        # the FTS matches rather than from the video_id index
+        query = (
+            db.query(Comment, ranked.c.score, ranked.c.fts_rowid)
+            .select_from(ranked)
+            .join(Comment, Comment.id == ranked.c.comment_id)
+        )
+        rows = _scope(query, video_id, from_ts, to_ts).order_by(ranked.c.score, ranked.c.fts_rowid).limit(limit).all()
+        return [(comment, (score, fts_rowid)) for comment, score, fts_rowid in rows]
+
+    hits: List[Tuple[Comment, SearchPosition]] = []
+    batch = limit + SEARCH_OVERFETCH
+    while True:
+        sql, params = _ranked_sqlite_sql(after)
+        ranked = db.execute(
+            text(sql + " ORDER BY score, rowid LIMIT :batch"), {"match": match, "batch": batch, **params}
+        ).all()
+        live = dict(
+            db.query(fts.c.rowid, Comment)
+            .select_from(fts)
+            .join(Comment, Comment.id == fts.c.comment_id)
+            .filter(fts.c.rowid.in_([fts_rowid for fts_rowid, _ in ranked]), Comment.deleted_at.is_(None))
+            .all()
+        )
+        for fts_rowid, score in ranked:
+            comment = live.get(fts_rowid)
+            if comment is not None:
+                hits.append((comment, (score, fts_rowid)))
+                if len(hits) == limit:
+                    return hits
+        if len(ranked) < batch:
+            return hits
+        # Some candidates were soft-deleted: rank the next, larger batch
+        after = (ranked[-1][1], ranked[-1][0])
+        batch *= 2
@@ -0,0 +1,167 @@
+"""
+Denormalized per-video comment statistics for ReMo
+videos.comment_count (live comments), videos.author_count (distinct authors of
+live comments) and videos.last_activity_at (last comment insert/soft delete)
+are kept up to date in the same transaction as each write, so nothing has to
+scan the comments table to report them. Distinct authors are tracked through
+per-(video, author) counts in comment_author_counts.
+
+Rebuild everything from the comments table with:
+    python -m app.video_stats [--video-id ID]
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+import argparse
+import logging
+
+from sqlalchemy import case, delete, func, literal, update
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models import Comment, CommentAuthorCount, Video
+
+logger = logging.getLogger(__name__)
+
+# Guests have no author_id; they are counted once per display name
+GUEST_AUTHOR_PREFIX = "guest:"
+
+
+def author_key(author_id: Optional[str], author_name: Optional[str]) -> str:
+    # Same rule as _author_key_sql below
+    if author_id is not None:
+        return author_id
+    return GUEST_AUTHOR_PREFIX + (author_name or "")
+
+
+def _author_key_sql():
+    return func.coalesce(
+        Comment.author_id,
+        literal(GUEST_AUTHOR_PREFIX) + func.coalesce(Comment.author_name, "")
+    )
+
+
+def record_comments_added(db: Session, video_id: str, rows: Iterable[Dict], at: Optional[datetime] = None) -> None:
+    """
+    Count newly inserted comment rows (author_id, author_name) against a video.
+    Runs in the caller's transaction; authors are upserted in a fixed order.
+    """
+    per_author = Counter(author_key(row.get("author_id"), row.get("author_name")) for row in rows)
+    if not per_author:
+        return
+
+    dialect = db.get_bind().dialect.name
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    table = CommentAuthorCount.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["video_id", "author_key"],
+        set_={"count": table.c.count + stmt.excluded.count},
+    ).returning(table.c.author_key, table.c.count)
+    # One executemany upsert (sent as multi-row INSERT ... RETURNING batches);
+    # an author is new when its count is exactly what this call added
+    counts = db.execute(stmt, [
+        {"video_id": video_id, "author_key": key, "count": per_author[key]}
+        for key in sorted(per_author)
+    ]).all()
+    new_authors = sum(1 for key, count in counts if count == per_author[key])
+
+    db.execute(
+        update(Video).where(Video.id == video_id).values(
+            comment_count=Video.comment_count + sum(per_author.values()),
+            author_count=Video.author_count + new_authors,
+            last_activity_at=at or datetime.now(timezone.utc),
+        )
+    )
+
+
+def record_comment_deleted(db: Session, comment: Comment, at: Optional[datetime] = None) -> None:
+    """Remove a soft-deleted comment from its video's stats (caller's transaction)"""
+    table = CommentAuthorCount.__table__
+    key = author_key(comment.author_id, comment.author_name)
+    match = (table.c.video_id == comment.video_id) & (table.c.author_key == key)
+    remaining = db.execute(
+        update(table).where(match).values(count=table.c.count - 1).returning(table.c.count)
+    ).scalar()
+    author_gone = remaining is not None and remaining <= 0
+    if author_gone:
+        db.execute(delete(table).where(match))
+
+    db.execute(
+        update(Video).where(Video.id == comment.video_id).values(
+            comment_count=Video.comment_count - 1,
+            author_count=Video.author_count - (1 if author_gone else 0),
+            last_activity_at=at or datetime.now(timezone.utc),
+        )
+    )
+
+
+def reconcile_video_stats(db: Session, video_id: Optional[str] = None) -> int:
+    """
+    Recompute stats from the comments table (one video, or all when video_id is None).
+    Used to backfill or repair drift; commits and returns the number of videos updated.
+    """
+    author_delete = delete(CommentAuthorCount)
+    video_reset = update(Video).values(comment_count=0, author_count=0, last_activity_at=None)
+    if video_id is not None:
+        author_delete = author_delete.where(CommentAuthorCount.video_id == video_id)
+        video_reset = video_reset.where(Video.id == video_id)
+    db.execute(author_delete)
+    db.execute(video_reset)
+
+    key = _author_key_sql()
+    author_query = db.query(Comment.video_id, key, func.count(Comment.id)).filter(
+        Comment.deleted_at.is_(None)
+    )
+    stats_query = db.query(
+        Comment.video_id,
+        func.sum(case((Comment.deleted_at.is_(None), 1), else_=0)),
+        func.max(Comment.created_at),
+        func.max(Comment.deleted_at),
+    )
+    if video_id is not None:
+        author_query = author_query.filter(Comment.video_id == video_id)
+        stats_query = stats_query.filter(Comment.video_id == video_id)
+
+    author_rows = author_query.group_by(Comment.video_id, key).all()
+    if author_rows:
+        db.execute(
+            CommentAuthorCount.__table__.insert(),
+            [{"video_id": vid, "author_key": k, "count": count} for vid, k, count in author_rows]
+        )
+    authors_per_video = Counter(vid for vid, _, _ in author_rows)
+
+    updates = []
+    for vid, live, last_created, last_deleted in stats_query.group_by(Comment.video_id).all():
+        updates.append({
+            "id": vid,
+            "comment_count": live or 0,
+            "author_count": authors_per_video.get(vid, 0),
+            "last_activity_at": max(t for t in (last_created, last_deleted) if t is not None),
+        })
+    if updates:
+        # Bulk UPDATE by primary key (one executemany)
+        db.execute(update(Video), updates)
+    db.commit()
+    logger.info(f"[VIDEO_STATS] Reconciled stats for {len(updates)} videos (video_id={video_id or 'all'})")
+    return len(updates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild per-video comment statistics from the comments table")
+    parser.add_argument("--video-id", help="Only reconcile this video")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from app.db import SessionLocal
+    db = SessionLocal()
+    try:
+        updated = reconcile_video_stats(db, args.video_id)
+    finally:
+        db.close()
+    print(f"Reconciled comment stats for {updated} video(s)")
+
+
+if __name__ == "__main__":
+    main()
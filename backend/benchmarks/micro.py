@@ -0,0 +1,183 @@
+"""
+Microbenchmarks for single code paths (no HTTP load generation)
+
+    cd backend
+    python -m benchmarks.micro token_cache      # cached vs full JWT access-token check
+    python -m benchmarks.micro group_commit     # comment write path from many threads
+    python -m benchmarks.micro columnar         # JSON vs columnar comment pages
+
+Each benchmark runs against a fresh temp SQLite database and prints its numbers.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+import argparse
+import os
+import tempfile
+import time
+import timeit
+import uuid
+
+
+def _setup_database() -> str:
+    """Create the schema and one video; returns the video id"""
+    from app.db import SessionLocal, engine
+    from app.models import Base, Video
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        video = Video(id=str(uuid.uuid4()), title="Benchmark video",
+                      video_url="https://example.invalid/v.mp4", duration_seconds=3600)
+        db.add(video)
+        db.commit()
+        return video.id
+    finally:
+        db.close()
+
+
+def _comment_row(video_id: str, i: int) -> Dict:
+    from benchmarks.seed import WORDS
+    return {
+        "video_id": video_id,
+        "author_name": f"User {i}",
+        "author_id": f"user{i}",
+        "timestamp_seconds": float(i % 3600),
+        "body": " ".join(WORDS[(i + j) % len(WORDS)] for j in range(12)),
+    }
+
+
+def bench_token_cache(args) -> None:
+    """verify_access_token on one token: cache hit vs a full jwt.decode"""
+    from app.auth import _token_cache, create_access_token, verify_access_token
+
+    token = create_access_token("user-1", "user@example.invalid", "User")
+    verify_access_token(token)
+    cached = timeit.timeit(lambda: verify_access_token(token), number=args.iterations)
+
+    def uncached():
+        _token_cache.clear()
+        verify_access_token(token)
+    full = timeit.timeit(uncached, number=args.iterations)
+    print(f"verify_access_token, {args.iterations} calls on the same token")
+    print(f"  cached:      {cached / args.iterations * 1e6:.1f} us/call")
+    print(f"  full decode: {full / args.iterations * 1e6:.1f} us/call")
+
+
+def bench_group_commit(args) -> None:
+    """insert_comments from args.threads threads: one commit per comment vs group commit"""
+    from app.comment_writes import CommentWriteBuffer, insert_comments
+    from app.db import SessionLocal
+
+    video_id = _setup_database()
+
+    def per_request(row: Dict) -> None:
+        db = SessionLocal()
+        try:
+            insert_comments(db, [row])
+            db.commit()
+        finally:
+            db.close()
+
+    buffer = CommentWriteBuffer(SessionLocal)
+
+    def run(label: str, write: Callable[[Dict], object]) -> None:
+        rows = [_comment_row(video_id, i) for i in range(args.comments)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(write, rows))
+        elapsed = time.perf_counter() - started
+        print(f"  {label}: {args.comments / elapsed:.0f} comments/s")
+
+    print(f"{args.comments} comments from {args.threads} threads (SQLite)")
+    run("commit per comment", per_request)
+    run("group commit      ", buffer.submit)
+    print(f"  average group-commit batch: {buffer.stats()['avg_batch_size']}")
+
+
+def bench_columnar(args) -> None:
+    """Serialization cost and size of one page, plus end-to-end GETs with the page cache off"""
+    from fastapi.testclient import TestClient
+    from app.comment_writes import insert_comments
+    from app.db import SessionLocal
+    from app.main import _comment_list_adapter, _encode_columnar_comments, app
+    from app.models import Comment
+
+    video_id = _setup_database()
+    db = SessionLocal()
+    try:
+        insert_comments(db, [_comment_row(video_id, i) for i in range(args.page_size)])
+        db.commit()
+        comments = db.query(Comment).filter(Comment.video_id == video_id).all()
+        columns = db.query(
+            Comment.id, Comment.timestamp_seconds, Comment.author_id,
+            Comment.author_name, Comment.body, Comment.created_at
+        ).filter(Comment.video_id == video_id).all()
+    finally:
+        db.close()
+
+    def as_json() -> bytes:
+        return _comment_list_adapter.dump_json(_comment_list_adapter.validate_python(comments, from_attributes=True))
+
+    encoders = {
+        "json (per-row models)": as_json,
+        "columnar": lambda: _encode_columnar_comments(video_id, columns, False)[0],
+        "columnar + gzip": lambda: _encode_columnar_comments(video_id, columns, True)[0],
+    }
+    print(f"{args.page_size}-comment page")
+    for label, encode in encoders.items():
+        seconds = timeit.timeit(encode, number=args.iterations) / args.iterations
+        print(f"  {label:<22} {seconds * 1000:6.2f} ms  {len(encode()) / 1024:6.1f} KB")
+
+    client = TestClient(app)
+    path = f"/videos/{video_id}/comments?limit={args.page_size}"
+    for label, suffix, headers in (("json", "", {}), ("columnar", "&format=columnar", {"Accept-Encoding": "gzip"})):
+        latencies: List[float] = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            assert client.get(path + suffix, headers=headers).status_code == 200
+            latencies.append(time.perf_counter() - started)
+        print(f"  GET {label:<8} {sum(latencies) / len(latencies) * 1000:6.2f} ms mean (page cache off)")
+
+
+BENCHMARKS = {
+    "token_cache": bench_token_cache,
+    "group_commit": bench_group_commit,
+    "columnar": bench_columnar,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ReMo microbenchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=None, help="Timed calls (default depends on the benchmark)")
+    parser.add_argument("--comments", type=int, default=2000, help="group_commit: comments to write")
+    parser.add_argument("--threads", type=int, default=32, help="group_commit: writer threads")
+    parser.add_argument("--page-size", type=int, default=500, help="columnar: comments per page")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra app setting, e.g. --env SQLITE_TUNED=false (repeatable)")
+    args = parser.parse_args()
+    if args.iterations is None:
+        args.iterations = {"token_cache": 20_000, "columnar": 200}.get(args.benchmark, 1)
+
+    # App settings must be in the environment before any app module is imported
+    temp_dir = tempfile.TemporaryDirectory(prefix="remo-micro-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'micro.db')}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["FAST_START"] = "true"
+    os.environ["COMMENT_CACHE_MAX_BYTES"] = "0"
+    os.environ["GROUP_COMMIT_ENABLED"] = "false"
+    if args.benchmark == "group_commit":
+        # Plain SQLite gives up on a locked database after 5s with this many
+        # writers; tuned mode queues them on its single writer connection
+        os.environ.setdefault("SQLITE_TUNED", "true")
+    for item in args.env:
+        key, _, value = item.partition("=")
+        os.environ[key] = value
+    try:
+        BENCHMARKS[args.benchmark](args)
+    finally:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
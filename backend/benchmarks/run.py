@@ -0,0 +1,282 @@
+"""
+Load-testing harness for the ReMo comment API
+
+Boots the app against a fresh temp SQLite database (or --database-url, e.g. a
+local Postgres), seeds synthetic videos/comments, drives concurrent async
+traffic per scenario and writes throughput and latency percentiles as JSON.
+
+    cd backend
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.run --comments 100000 --out bench.json
+    python -m benchmarks.run --comments 100000 --baseline bench.json   # compare
+
+--transport asgi (default) calls the app in-process through httpx's ASGI
+transport; --transport http starts uvicorn in a subprocess and goes over TCP.
+"""
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_ORDER = ["catalog_browse", "hot_video_readers", "hot_video_readers_columnar", "comment_search", "live_burst"]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies: List[float], statuses: Dict[str, int], errors: int, elapsed: float) -> Dict:
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1]) if latencies else 0.0,
+        },
+        "statuses": dict(sorted(statuses.items())),
+        "errors": errors,
+    }
+
+
+async def drive(scenario, client, total: int, concurrency: int) -> Dict:
+    """Run total requests from concurrency workers; returns the summary"""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    issued = 0
+
+    async def worker():
+        nonlocal issued, errors
+        state: Dict = {}
+        while issued < total:
+            issued += 1
+            started = time.perf_counter()
+            try:
+                response = await scenario.run_one(client, state)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            if not status.isdigit() or int(status) >= 500:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, errors, time.perf_counter() - started)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_up(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+async def run_benchmarks(args, data: Dict) -> Dict:
+    import httpx
+    from benchmarks.scenarios import SCENARIOS
+
+    process: Optional[subprocess.Popen] = None
+    app = None
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.transport == "http":
+        port = _free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+            env=os.environ.copy(),
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        await _wait_until_up(base_url, process)
+        client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+    else:
+        from app.main import app
+        await app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    results: Dict = {}
+    try:
+        for offset, name in enumerate(args.scenarios):
+            scenario = SCENARIOS[name](data, args.seed + offset)
+            if args.warmup:
+                await drive(scenario, client, args.warmup, args.concurrency)
+            summary = await drive(scenario, client, args.requests, args.concurrency)
+            summary["description"] = scenario.description
+            results[name] = summary
+            latency = summary["latency_ms"]
+            print(
+                f"{name:28s} {summary['throughput_rps']:9.1f} req/s  "
+                f"p50 {latency['p50']:8.2f}ms  p95 {latency['p95']:8.2f}ms  p99 {latency['p99']:8.2f}ms  "
+                f"errors {summary['errors']}"
+            )
+    finally:
+        await client.aclose()
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        if app is not None:
+            await app.router.shutdown()
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print deltas against a baseline; returns the scenarios that regressed"""
+    regressions = []
+    print(f"\nCompared with baseline ({baseline.get('meta', {}).get('git_commit', 'unknown')[:12]}):")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            print(f"  {name:28s} (not in baseline)")
+            continue
+        rps_delta = (current["throughput_rps"] - previous["throughput_rps"]) / max(previous["throughput_rps"], 1e-9)
+        p95_delta = (current["latency_ms"]["p95"] - previous["latency_ms"]["p95"]) / max(previous["latency_ms"]["p95"], 1e-9)
+        regressed = rps_delta < -threshold or p95_delta > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:28s} throughput {rps_delta:+7.1%}  p95 {p95_delta:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the ReMo comment API")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_ORDER), help="Comma-separated scenario names (default: all)")
+    parser.add_argument("--database-url", help="Use this database instead of a fresh temp SQLite file")
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=10_000, help="Synthetic comments to seed (10k-1M)")
+    parser.add_argument("--hot-share", type=float, default=0.5, help="Fraction of comments on the hot video")
+    parser.add_argument("--authors", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=2_000, help="Timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--transport", choices=("asgi", "http"), default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (http transport)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra app setting, e.g. --env GROUP_COMMIT_ENABLED=true (repeatable)")
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any scenario regressed")
+    args = parser.parse_args()
+
+    from benchmarks.scenarios import SCENARIOS
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    # App settings must be in the environment before any app module is imported
+    temp_dir = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        temp_dir = tempfile.TemporaryDirectory(prefix="remo-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'bench.db')}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["FAST_START"] = "true"  # the harness creates the schema itself
+    for item in args.env:
+        key, _, value = item.partition("=")
+        os.environ[key] = value
+
+    from benchmarks.seed import load_existing, seed_database
+    from app.models import Video
+    from app.db import DB_SCHEME, SessionLocal, engine
+    from sqlalchemy import inspect
+
+    reuse = False
+    if args.database_url and "videos" in inspect(engine).get_table_names():
+        db = SessionLocal()
+        try:
+            reuse = db.query(Video.id).first() is not None
+        finally:
+            db.close()
+    if reuse:
+        print("Database already has videos; reusing it without seeding")
+        data = load_existing()
+    else:
+        print(f"Seeding {args.videos} videos / {args.comments} comments ({DB_SCHEME})...")
+        data = seed_database(args.videos, args.comments, args.hot_share, args.authors, args.seed)
+        print(f"Seeded in {data['seconds']}s")
+
+    scenario_results = asyncio.run(run_benchmarks(args, data))
+    results = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "db": DB_SCHEME,
+            "transport": args.transport,
+            "workers": args.workers if args.transport == "http" else None,
+            "videos": len(data["video_ids"]) if reuse else args.videos,
+            "comments": None if reuse else args.comments,
+            "requests_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "env": args.env,
+        },
+        "scenarios": scenario_results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    engine.dispose()
+    if temp_dir is not None:
+        temp_dir.cleanup()
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
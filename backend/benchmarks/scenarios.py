@@ -0,0 +1,102 @@
+"""
+Benchmark scenarios for the ReMo comment API
+Each scenario issues one request per call to run_one(); the harness drives
+many calls concurrently and times them. Per-worker state (catalog cursors)
+lives in the dict passed as `state`.
+"""
+from typing import Dict
+import itertools
+import random
+
+import httpx
+
+from benchmarks.seed import VIDEO_DURATION_SECONDS, WORDS, make_body
+
+# Playback windows viewers of the hot video keep asking for (cacheable)
+HOT_WINDOWS = 60
+WINDOW_SECONDS = 30
+
+
+class Scenario:
+    name = ""
+    description = ""
+
+    def __init__(self, data: Dict, seed: int):
+        self.data = data
+        self.rng = random.Random(seed)
+
+    async def run_one(self, client: httpx.AsyncClient, state: Dict) -> httpx.Response:
+        raise NotImplementedError
+
+
+class LiveBurst(Scenario):
+    name = "live_burst"
+    description = "Many viewers posting comments on the hot video at once (each poster is a distinct author)"
+
+    def __init__(self, data: Dict, seed: int):
+        super().__init__(data, seed)
+        self._authors = itertools.count()
+
+    async def run_one(self, client, state):
+        author = next(self._authors)
+        return await client.post(
+            f"/videos/{self.data['hot_video_id']}/comments",
+            json={
+                "timestamp_seconds": round(self.rng.uniform(0, VIDEO_DURATION_SECONDS), 3),
+                "body": make_body(self.rng),
+                "author_id": f"burst{author}",
+                "author_name": f"Burst {author}",
+            },
+        )
+
+
+class HotVideoReaders(Scenario):
+    name = "hot_video_readers"
+    description = "Many viewers reading 30s comment windows of the hot video"
+    params: Dict = {}
+
+    async def run_one(self, client, state):
+        start = self.rng.randrange(HOT_WINDOWS) * WINDOW_SECONDS
+        return await client.get(
+            f"/videos/{self.data['hot_video_id']}/comments",
+            params={"from_ts": start, "to_ts": start + WINDOW_SECONDS, "limit": 100, **self.params},
+        )
+
+
+class HotVideoReadersColumnar(HotVideoReaders):
+    name = "hot_video_readers_columnar"
+    description = "hot_video_readers using the columnar response format"
+    params = {"format": "columnar"}
+
+
+class CatalogBrowse(Scenario):
+    name = "catalog_browse"
+    description = "Home-page catalog paging (24 per page, projected fields) plus video detail views"
+
+    async def run_one(self, client, state):
+        roll = self.rng.random()
+        if roll < 0.25:
+            return await client.get(f"/videos/{self.rng.choice(self.data['video_ids'])}")
+        params = {"limit": 24, "fields": "id,title,thumbnail_url,comment_count"}
+        if state.get("cursor") and roll < 0.8:
+            params["cursor"] = state["cursor"]
+        response = await client.get("/videos", params=params)
+        state["cursor"] = response.headers.get("x-next-cursor")
+        return response
+
+
+class CommentSearch(Scenario):
+    name = "comment_search"
+    description = "Full-text comment search: one or two words, half scoped to the hot video"
+
+    async def run_one(self, client, state):
+        params = {"q": " ".join(self.rng.sample(WORDS, self.rng.randint(1, 2))), "limit": 20}
+        if self.rng.random() < 0.5:
+            params["video_id"] = self.data["hot_video_id"]
+        return await client.get("/comments/search", params=params)
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (LiveBurst, HotVideoReaders, HotVideoReadersColumnar, CatalogBrowse, CommentSearch)
+}
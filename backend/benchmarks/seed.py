@@ -0,0 +1,103 @@
+"""
+Synthetic data for the ReMo benchmarks
+Bulk-loads videos and comments with Core executemany (deterministic for a
+given seed), then rebuilds the derived tables (histogram buckets, per-video
+stats, search index) so the database looks like one maintained by the API.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+import random
+import time
+import uuid
+
+VIDEO_DURATION_SECONDS = 3600
+INSERT_CHUNK = 10_000
+WORDS = (
+    "nice goal replay wow that lol look here again amazing clip music drop "
+    "best part watch this moment camera angle slow motion crowd live"
+).split()
+
+
+def make_body(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 30)))
+
+
+def seed_database(video_count: int, comment_count: int, hot_share: float, authors: int, seed: int) -> Dict:
+    """
+    Create the schema and load video_count videos and comment_count comments.
+    The first video is the hot one and receives hot_share of the comments.
+    Returns {"hot_video_id", "video_ids", "seconds"}.
+    """
+    from app.db import SessionLocal, engine
+    from app.histogram import rebuild_comment_histograms
+    from app.models import Base, Comment, Video
+    from app.search import ensure_search_index
+    from app.video_stats import reconcile_video_stats
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+
+    base_time = datetime(2026, 1, 1)
+    video_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(video_count)]
+    with engine.begin() as conn:
+        conn.execute(Video.__table__.insert(), [
+            {
+                "id": video_id,
+                "title": f"Benchmark video {i}",
+                "description": make_body(rng),
+                "video_url": f"https://example.invalid/videos/{i}.mp4",
+                "thumbnail_url": f"https://example.invalid/thumbs/{i}.jpg",
+                "duration_seconds": VIDEO_DURATION_SECONDS,
+                "created_at": base_time + timedelta(minutes=i),
+            }
+            for i, video_id in enumerate(video_ids)
+        ])
+
+    hot_count = int(comment_count * hot_share)
+    remaining = comment_count
+    inserted = 0
+    while remaining > 0:
+        chunk: List[Dict] = []
+        for _ in range(min(INSERT_CHUNK, remaining)):
+            hot = inserted < hot_count
+            author = rng.randrange(authors)
+            chunk.append({
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "video_id": video_ids[0] if hot else rng.choice(video_ids),
+                "author_id": f"user{author}",
+                "author_name": f"User {author}",
+                "timestamp_seconds": round(rng.uniform(0, VIDEO_DURATION_SECONDS), 3),
+                "body": make_body(rng),
+                "created_at": base_time + timedelta(seconds=inserted),
+                "deleted_at": None,
+            })
+            inserted += 1
+        with engine.begin() as conn:
+            conn.execute(Comment.__table__.insert(), chunk)
+        remaining -= len(chunk)
+        if inserted % 100_000 == 0 or remaining == 0:
+            print(f"  {inserted}/{comment_count} comments", flush=True)
+
+    db = SessionLocal()
+    try:
+        rebuild_comment_histograms(db)
+        reconcile_video_stats(db)
+        ensure_search_index(db)  # after the bulk load: one backfill instead of per-row triggers
+    finally:
+        db.close()
+    return {"hot_video_id": video_ids[0], "video_ids": video_ids, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def load_existing(limit: int = 1000) -> Dict:
+    """Reuse an already seeded database: the video with the most comments is the hot one"""
+    from app.db import SessionLocal
+    from app.models import Video
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Video.id).order_by(Video.comment_count.desc(), Video.id).limit(limit).all()
+    finally:
+        db.close()
+    video_ids = [row.id for row in rows]
+    return {"hot_video_id": video_ids[0], "video_ids": video_ids, "seconds": 0.0}
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the backend tests
+
+App settings are read from the environment at import time, so a throwaway
+SQLite database is configured here before any app module is imported.
+
+    cd backend
+    pip install -r requirements-dev.txt
+    pytest
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_test_dir = tempfile.TemporaryDirectory(prefix="remo-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_test_dir.name, 'test.db')}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.pop("FAST_START", None)
+
+
+@pytest.fixture(scope="session")
+def app():
+    import asyncio
+    from app.main import app as fastapi_app
+
+    asyncio.run(fastapi_app.router.startup())
+    yield fastapi_app
+    asyncio.run(fastapi_app.router.shutdown())
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def video_id(app) -> str:
+    """A fresh video with no comments"""
+    from app.db import SessionLocal
+    from app.models import Video
+
+    db = SessionLocal()
+    try:
+        video = Video(id=str(uuid.uuid4()), title="Test video", video_url="https://example.invalid/v.mp4",
+                      duration_seconds=600)
+        db.add(video)
+        db.commit()
+        return video.id
+    finally:
+        db.close()
@@ -0,0 +1,67 @@
+"""
+GET /videos: conditional requests against the catalog version, and keyset pages
+"""
+import uuid
+
+from sqlalchemy import event
+
+
+def test_catalog_etag_changes_with_comment_stats(client, video_id):
+    first = client.get("/videos")
+    etag = first.headers["ETag"]
+    assert client.get("/videos", headers={"If-None-Match": etag}).status_code == 304
+
+    response = client.post(f"/videos/{video_id}/comments",
+                           json={"author_name": "Tester", "author_id": str(uuid.uuid4()), "timestamp_seconds": 1.0, "body": "hi"})
+    assert response.status_code == 200
+    refreshed = client.get("/videos", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert next(video for video in refreshed.json() if video["id"] == video_id)["comment_count"] == 1
+
+
+def test_catalog_etag_changes_when_a_comment_is_deleted(client, video_id):
+    author_id = str(uuid.uuid4())
+    created = client.post(f"/videos/{video_id}/comments",
+                          json={"author_name": "Tester", "author_id": author_id, "timestamp_seconds": 1.0, "body": "hi"})
+    etag = client.get("/videos").headers["ETag"]
+
+    deleted = client.delete(f"/videos/{video_id}/comments/{created.json()['id']}", params={"user_id": author_id})
+    assert deleted.status_code == 204
+    refreshed = client.get("/videos", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert next(video for video in refreshed.json() if video["id"] == video_id)["comment_count"] == 0
+
+
+def test_catalog_etag_maxima_are_index_lookups(client, video_id):
+    from app.db import read_engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "max(" in statement:
+            statements.append(statement)
+
+    event.listen(read_engine, "before_cursor_execute", record)
+    try:
+        client.get("/videos")
+    finally:
+        event.remove(read_engine, "before_cursor_execute", record)
+    assert len(statements) == 1, statements
+    with read_engine.connect() as conn:
+        plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statements[0]}")]
+    assert "SEARCH videos USING COVERING INDEX ix_videos_created_at_id" in plan, plan
+    assert "SEARCH videos USING COVERING INDEX ix_videos_last_activity_at" in plan, plan
+
+
+def test_catalog_pages_cover_every_video_once(client, video_id):
+    all_ids = [video["id"] for video in client.get("/videos").json()]
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "fields": "id", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/videos", params=params)
+        seen += [video["id"] for video in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == all_ids
@@ -0,0 +1,72 @@
+"""
+Delta sync (GET /videos/{id}/comments/changes): the watermark is a position in
+the video's change sequence, so no insert or soft delete is ever skipped.
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.comment_writes import insert_comments
+from app.db import SessionLocal
+
+
+def _insert(video_id: str, count: int, created_at=None) -> list:
+    db = SessionLocal()
+    try:
+        rows = [
+            {"video_id": video_id, "author_name": "Tester", "author_id": "user-1",
+             "timestamp_seconds": float(i), "body": f"comment {i}",
+             **({"created_at": created_at} if created_at else {})}
+            for i in range(count)
+        ]
+        stored = insert_comments(db, rows)
+        db.commit()
+        return [row["id"] for row in stored]
+    finally:
+        db.close()
+
+
+def _sync(client, video_id: str, since=None, limit=500):
+    params = {"limit": limit, **({"since": since} if since else {})}
+    response = client.get(f"/videos/{video_id}/comments/changes", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_paged_sync_returns_every_change_once(client, video_id):
+    ids = _insert(video_id, 7)
+    seen, since = [], None
+    while True:
+        page = _sync(client, video_id, since, limit=3)
+        seen += [comment["id"] for comment in page["comments"]]
+        since = page["watermark"]
+        if not page["has_more"]:
+            break
+    assert seen == ids
+
+    caught_up = _sync(client, video_id, since)
+    assert caught_up == {"comments": [], "deleted": [], "watermark": since, "has_more": False}
+
+
+def test_changes_committed_with_old_timestamps_are_not_skipped(client, video_id):
+    _insert(video_id, 2)
+    since = _sync(client, video_id)["watermark"]
+    # A slow transaction: its created_at predates the previous sync
+    late = _insert(video_id, 1, created_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    page = _sync(client, video_id, since)
+    assert [comment["id"] for comment in page["comments"]] == late
+
+
+def test_soft_delete_arrives_as_tombstone(client, video_id):
+    (comment_id,) = _insert(video_id, 1)
+    since = _sync(client, video_id)["watermark"]
+    response = client.delete(f"/videos/{video_id}/comments/{comment_id}", params={"user_id": "user-1"})
+    assert response.status_code == 204
+    page = _sync(client, video_id, since)
+    assert page["comments"] == []
+    assert [tombstone["id"] for tombstone in page["deleted"]] == [comment_id]
+    # A fresh client never sees the deleted comment at all
+    assert _sync(client, video_id)["comments"] == []
+
+
+def test_malformed_watermark_is_rejected(client, video_id):
+    response = client.get(f"/videos/{video_id}/comments/changes", params={"since": "2026-01-01T00:00:00"})
+    assert response.status_code == 400
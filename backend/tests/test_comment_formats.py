@@ -0,0 +1,39 @@
+"""
+GET /videos/{id}/comments is negotiated on Accept and Accept-Encoding, so every
+variant (and its 304) must carry the same Vary header.
+"""
+import uuid
+
+import pytest
+
+VARY = "Accept, Accept-Encoding"
+
+
+@pytest.fixture
+def commented_video(client, video_id):
+    for i in range(3):
+        # Distinct authors, so the per-user rate limit never kicks in
+        response = client.post(f"/videos/{video_id}/comments", json={
+            "author_name": "Tester", "author_id": str(uuid.uuid4()), "timestamp_seconds": float(i), "body": f"comment {i}"
+        })
+        assert response.status_code == 200
+    return video_id
+
+
+@pytest.mark.parametrize("params,headers", [
+    ({}, {}),
+    ({"format": "columnar"}, {}),
+    ({}, {"Accept": "application/vnd.remo.columnar+json", "Accept-Encoding": "gzip"}),
+])
+def test_every_comment_page_variant_sends_vary(client, commented_video, params, headers):
+    path = f"/videos/{commented_video}/comments"
+    first = client.get(path, params=params, headers=headers)
+    assert first.status_code == 200
+    assert first.headers["Vary"] == VARY
+
+    # Second request is served from the page cache; the 304 keeps Vary too
+    cached = client.get(path, params=params, headers=headers)
+    assert cached.headers["Vary"] == VARY
+    not_modified = client.get(path, params=params, headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["Vary"] == VARY
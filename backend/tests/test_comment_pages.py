@@ -0,0 +1,93 @@
+"""
+GET /videos/{id}/comments time window and keyset pagination: from_ts/to_ts
+are inclusive, an inverted window is rejected, and following X-Next-Cursor
+visits every live comment exactly once, in order, even when many comments
+share a timestamp_seconds (and created_at).
+"""
+from datetime import datetime
+
+import pytest
+
+from app.comment_writes import insert_comments
+from app.db import SessionLocal
+
+
+def _insert(video_id: str, timestamps, created_at=None):
+    db = SessionLocal()
+    try:
+        rows = [
+            {"video_id": video_id, "author_id": f"user-{i}", "author_name": f"User {i}",
+             "timestamp_seconds": float(ts), "body": f"comment {i}"}
+            for i, ts in enumerate(timestamps)
+        ]
+        if created_at is not None:
+            rows = [{**row, "created_at": created_at} for row in rows]
+        stored = insert_comments(db, rows)
+        db.commit()
+        return stored
+    finally:
+        db.close()
+
+
+def _timestamps(response):
+    assert response.status_code == 200
+    return [comment["timestamp_seconds"] for comment in response.json()]
+
+
+def test_window_bounds_are_inclusive(client, video_id):
+    _insert(video_id, [9.5, 10, 15, 20, 20.5])
+    path = f"/videos/{video_id}/comments"
+    assert _timestamps(client.get(path, params={"from_ts": 10, "to_ts": 20})) == [10, 15, 20]
+    assert _timestamps(client.get(path, params={"from_ts": 20})) == [20, 20.5]
+    assert _timestamps(client.get(path, params={"to_ts": 10})) == [9.5, 10]
+    assert _timestamps(client.get(path, params={"from_ts": 15, "to_ts": 15})) == [15]
+
+
+def test_inverted_window_is_rejected(client, video_id):
+    response = client.get(f"/videos/{video_id}/comments", params={"from_ts": 20, "to_ts": 10})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("params", [{}, {"format": "columnar"}])
+def test_cursor_walks_every_comment_once_with_ties(client, video_id, params):
+    # Three timestamps, seven comments each, all with the same created_at:
+    # only the id orders comments within a timestamp
+    same_time = datetime(2026, 1, 1, 12, 0, 0)
+    stored = _insert(video_id, [ts for ts in (1, 2, 3) for _ in range(7)], created_at=same_time)
+    expected = sorted((row["timestamp_seconds"], row["id"]) for row in stored)
+
+    path = f"/videos/{video_id}/comments"
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = client.get(path, params={**params, "limit": 4, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        if params:
+            seen.extend(zip(body["timestamps"], body["ids"]))
+        else:
+            seen.extend((comment["timestamp_seconds"], comment["id"]) for comment in body)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == expected
+    assert pages == 6  # 21 comments, 4 per page
+
+
+def test_cursor_skips_deleted_comments(client, video_id):
+    stored = _insert(video_id, [1, 2, 3, 4])
+    deleted = stored[1]
+    response = client.delete(f"/videos/{video_id}/comments/{deleted['id']}", params={"user_id": deleted["author_id"]})
+    assert response.status_code == 204
+
+    path = f"/videos/{video_id}/comments"
+    first = client.get(path, params={"limit": 2})
+    assert _timestamps(first) == [1, 3]
+    rest = client.get(path, params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert _timestamps(rest) == [4]
+    assert "X-Next-Cursor" not in rest.headers
+
+
+def test_malformed_cursor_is_rejected(client, video_id):
+    response = client.get(f"/videos/{video_id}/comments", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+"""
+Group commit keeps serving writes after a failed flush: a session that cannot
+be opened fails only the queued requests, not the flusher thread.
+"""
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.comment_writes import CommentWriteBuffer
+from app.db import SessionLocal
+
+
+def _row(video_id: str, body: str = "hello"):
+    return {"video_id": video_id, "author_id": "a", "author_name": "A", "timestamp_seconds": 1.0, "body": body}
+
+
+class FlakySessionFactory:
+    """Fails the first `failures` calls, like a pool timeout or a locked database"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("connect", {}, Exception("database is locked"))
+        return SessionLocal()
+
+
+def test_buffer_survives_a_failed_session(video_id):
+    buffer = CommentWriteBuffer(FlakySessionFactory(failures=1), interval_seconds=0.001)
+    with pytest.raises(OperationalError):
+        buffer.submit(_row(video_id), timeout=5)
+
+    stored = buffer.submit(_row(video_id, "after the failure"), timeout=5)
+    assert stored["body"] == "after the failure"
+    assert buffer.stats()["rows"] == 1
+
+
+def test_buffer_survives_a_failing_rollback(video_id):
+    class BrokenRollbackSession:
+        def __init__(self):
+            self.session = SessionLocal()
+
+        def __getattr__(self, name):
+            return getattr(self.session, name)
+
+        def rollback(self):
+            self.session.rollback()
+            raise OperationalError("rollback", {}, Exception("connection lost"))
+
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return BrokenRollbackSession() if len(calls) == 1 else SessionLocal()
+
+    buffer = CommentWriteBuffer(factory, interval_seconds=0.001)
+    # A NULL body violates NOT NULL, then the rollback fails too
+    with pytest.raises(OperationalError):
+        buffer.submit(_row(video_id, None), timeout=5)
+
+    stored = buffer.submit(_row(video_id, "still flushing"), timeout=5)
+    assert stored["body"] == "still flushing"
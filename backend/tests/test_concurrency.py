@@ -0,0 +1,49 @@
+"""
+Database-bound routes run in the worker threadpool, so parallel requests
+that wait on slow queries overlap instead of queueing behind the event loop.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+QUERY_DELAY_SECONDS = 0.2
+PARALLEL_REQUESTS = 8
+
+
+@pytest.fixture
+def slow_video_queries(app):
+    """Every SELECT on videos sleeps first, as if the database were slow"""
+    from app.db import engine, read_engine
+
+    def _sleep(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM videos" in statement:
+            time.sleep(QUERY_DELAY_SECONDS)
+
+    engines = {engine, read_engine}
+    for target in engines:
+        event.listen(target, "before_cursor_execute", _sleep)
+    yield
+    for target in engines:
+        event.remove(target, "before_cursor_execute", _sleep)
+
+
+async def _timed_gets(app, path: str, count: int) -> float:
+    # One event loop for every request, as under uvicorn
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(count)))
+        elapsed = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses)
+    return elapsed
+
+
+def test_parallel_reads_take_about_as_long_as_one(app, video_id, slow_video_queries):
+    path = f"/videos/{video_id}"
+    single = asyncio.run(_timed_gets(app, path, 1))
+    parallel = asyncio.run(_timed_gets(app, path, PARALLEL_REQUESTS))
+    # Serialized on the event loop this would be PARALLEL_REQUESTS x single
+    assert parallel < single * 3, f"{PARALLEL_REQUESTS} parallel reads took {parallel:.2f}s, one took {single:.2f}s"
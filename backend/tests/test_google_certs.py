@@ -0,0 +1,61 @@
+"""
+GoogleIdTokenVerifier cert refresh: a burst of tokens signed with a new key id
+triggers one forced fetch, which every concurrent caller then shares.
+"""
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.auth import GoogleIdTokenVerifier
+
+
+def _token_with_key_id(key_id: str) -> str:
+    def segment(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{segment({'alg': 'RS256', 'kid': key_id})}.{segment({'sub': '1'})}.c2ln"
+
+
+class SlowCertSource:
+    def __init__(self, delay_seconds: float = 0.2):
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay_seconds)
+        return {"old-key": "not a real cert"}, 3600
+
+
+def test_unknown_key_id_forces_a_single_shared_refresh():
+    source = SlowCertSource()
+    verifier = GoogleIdTokenVerifier(cert_source=source, min_forced_refresh_seconds=0)
+    verifier.get_certs()
+    assert source.calls == 1
+
+    token = _token_with_key_id("rotated-key")
+
+    def verify():
+        # The new key is still missing after the refresh, so decoding fails
+        with pytest.raises(ValueError):
+            verifier.verify(token, audience="client-id")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for future in [pool.submit(verify) for _ in range(8)]:
+            future.result()
+    assert source.calls == 2
+
+
+def test_known_key_id_uses_cached_certs():
+    source = SlowCertSource(delay_seconds=0)
+    verifier = GoogleIdTokenVerifier(cert_source=source, min_forced_refresh_seconds=0)
+    with pytest.raises(ValueError):
+        verifier.verify(_token_with_key_id("old-key"), audience="client-id")
+    with pytest.raises(ValueError):
+        verifier.verify(_token_with_key_id("old-key"), audience="client-id")
+    assert source.calls == 1
@@ -0,0 +1,77 @@
+"""
+Query-plan regression tests for the get_comments read path: it must be an
+index range scan on ix_comments_video_live_order with no sort step.
+
+The Postgres variant runs when REMO_TEST_POSTGRES_URL points at a scratch
+database (the schema is created there with create_all).
+"""
+from datetime import datetime
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+INDEX_NAME = "ix_comments_video_live_order"
+
+PAGE_SHAPES = {
+    "first_page": {},
+    "time_window": {"from_ts": 30.0, "to_ts": 60.0},
+    "cursor": {"after": (42.0, datetime(2026, 1, 1), "00000000-0000-0000-0000-000000000000")},
+}
+
+
+def _page_statement(db, **params):
+    from app.main import live_comments_page_query
+    from app.models import Comment
+
+    return live_comments_page_query(db.query(Comment), "video-1", **params).limit(101).statement
+
+
+def _explain(connection, statement, prefix: str):
+    compiled = statement.compile(dialect=connection.dialect)
+    params = compiled.construct_params()
+    if compiled.positiontup is not None:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return [row[-1] for row in connection.exec_driver_sql(f"{prefix} {compiled}", params)]
+
+
+@pytest.mark.parametrize("shape", sorted(PAGE_SHAPES))
+def test_sqlite_comment_page_uses_live_order_index(app, shape):
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        plan = _explain(db.connection(), _page_statement(db, **PAGE_SHAPES[shape]), "EXPLAIN QUERY PLAN")
+    finally:
+        db.close()
+    assert any(INDEX_NAME in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+@pytest.fixture(scope="module")
+def postgres_engine():
+    url = os.getenv("REMO_TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("REMO_TEST_POSTGRES_URL is not set")
+    from app.models import Base
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("shape", sorted(PAGE_SHAPES))
+def test_postgres_comment_page_uses_live_order_index(postgres_engine, shape):
+    from sqlalchemy.orm import Session
+
+    with Session(postgres_engine) as db:
+        # On a near-empty table a seq scan plus sort is cheapest; penalize both
+        # so the plan shows whether the index can serve the query on its own
+        db.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+        db.connection().exec_driver_sql("SET LOCAL enable_sort = off")
+        plan = _explain(db.connection(), _page_statement(db, **PAGE_SHAPES[shape]), "EXPLAIN")
+    text_plan = "\n".join(plan)
+    assert INDEX_NAME in text_plan, text_plan
+    assert "Sort" not in text_plan, text_plan
+    assert "Seq Scan" not in text_plan, text_plan
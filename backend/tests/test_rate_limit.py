@@ -0,0 +1,124 @@
+"""
+Token-bucket rate limiting: burst and refill, the 429 with Retry-After, idle
+bucket eviction in the memory backend, and state shared between processes
+through the SQLite backend.
+"""
+import uuid
+
+import pytest
+
+from app.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    SQLiteRateLimitBackend,
+    get_rate_limit_backend,
+    set_rate_limit_backend,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, clock, tmp_path):
+    if request.param == "memory":
+        return InMemoryRateLimitBackend(capacity=5, window_seconds=10, clock=clock)
+    return SQLiteRateLimitBackend(str(tmp_path / "limits.db"), capacity=5, window_seconds=10, clock=clock)
+
+
+def test_burst_then_refill(backend, clock):
+    # A full bucket allows a burst of capacity, then rejects
+    assert [backend.acquire("u")[0] for _ in range(5)] == [True] * 5
+    is_allowed, wait = backend.acquire("u")
+    assert not is_allowed
+    assert wait == pytest.approx(2.0)  # one token every 10s / 5
+
+    # Tokens refill continuously: one after 2s, not two
+    clock.now += 2
+    assert backend.acquire("u")[0]
+    assert not backend.acquire("u")[0]
+
+    # Refill is capped at capacity however long the bucket sat idle
+    clock.now += 1000
+    assert [backend.acquire("u")[0] for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_buckets_are_per_key(backend):
+    for _ in range(5):
+        backend.acquire("a")
+    assert not backend.acquire("a")[0]
+    assert backend.acquire("b")[0]
+
+
+def test_reset_refills_every_bucket(backend):
+    for _ in range(5):
+        backend.acquire("u")
+    backend.reset()
+    assert backend.acquire("u")[0]
+
+
+def test_memory_backend_evicts_idle_buckets(clock):
+    backend = InMemoryRateLimitBackend(capacity=5, window_seconds=10, clock=clock)
+    for i in range(100):
+        backend.acquire(f"user-{i}")
+    assert len(backend) == 100
+
+    # A bucket idle for a full window has refilled, so it is dropped
+    clock.now += 10
+    backend.acquire("active")
+    assert len(backend) == 1
+
+
+def test_memory_backend_caps_tracked_keys(clock):
+    backend = InMemoryRateLimitBackend(capacity=5, window_seconds=10, clock=clock, max_keys=10)
+    for i in range(50):
+        backend.acquire(f"user-{i}")
+    assert len(backend) <= 10
+
+
+def test_sqlite_backend_shares_buckets_between_clients(clock, tmp_path):
+    # Two backends on the same file stand in for two worker processes
+    path = str(tmp_path / "shared.db")
+    first = SQLiteRateLimitBackend(path, capacity=5, window_seconds=10, clock=clock)
+    second = SQLiteRateLimitBackend(path, capacity=5, window_seconds=10, clock=clock)
+    for backend in (first, second, first, second, first):
+        assert backend.acquire("u")[0]
+    assert not second.acquire("u")[0]
+    assert not first.acquire("u")[0]
+
+    clock.now += 2
+    assert second.acquire("u")[0]
+    assert not first.acquire("u")[0]
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+
+def test_create_comment_returns_429_with_retry_after(client, video_id, clock):
+    previous = get_rate_limit_backend()
+    set_rate_limit_backend(InMemoryRateLimitBackend(capacity=5, window_seconds=10, clock=clock))
+    try:
+        path = f"/videos/{video_id}/comments"
+        comment = {"author_name": "Tester", "author_id": str(uuid.uuid4()), "timestamp_seconds": 1, "body": "hi"}
+        for _ in range(5):
+            assert client.post(path, json=comment).status_code == 200
+        rejected = client.post(path, json=comment)
+        assert rejected.status_code == 429
+        assert rejected.headers["Retry-After"] == "2"
+
+        clock.now += 2
+        assert client.post(path, json=comment).status_code == 200
+    finally:
+        set_rate_limit_backend(previous)
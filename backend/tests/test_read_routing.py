@@ -0,0 +1,108 @@
+"""
+Read-replica routing with read-your-writes stickiness. The replica is a
+separate SQLite file that never receives the writes (maximal lag). Runs in a
+fresh interpreter, since DATABASE_REPLICA_URL is read at import time.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app.read_routing import (
+    REPLICA_STICKY_CLOCK_SKEW_SECONDS,
+    REPLICA_STICKY_SECONDS,
+    STICKY_COOKIE,
+    STICKY_HEADER,
+    client_is_sticky,
+)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STICKY_READS_SCRIPT = textwrap.dedent("""
+    import json, os
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from app.db import engine
+    from app.main import app
+    from app.models import Base, Video
+    from app.read_routing import STICKY_HEADER, recent_writes
+    from sqlalchemy.orm import Session
+
+    # The app opens the replica read-only, so seed it through its own engine
+    for target in (engine, create_engine(os.environ["DATABASE_REPLICA_URL"])):
+        Base.metadata.create_all(bind=target)
+        with Session(target) as db:
+            db.add(Video(id="v1", title="Video", video_url="https://example.invalid/v.mp4"))
+            db.commit()
+
+    client = TestClient(app)
+    path = "/videos/v1/comments"
+    created = client.post(path, json={"author_name": "A", "author_id": "a", "timestamp_seconds": 1, "body": "hi"})
+    deadline = created.headers[STICKY_HEADER]
+    client.cookies.clear()
+
+    # Act as another app instance: it did not see the write, and its page
+    # cache holds a page read from the lagging replica
+    recent_writes._deadlines.clear()
+    stale = client.get(path).json()
+
+    print(json.dumps({
+        "stale": len(stale),
+        "expired": len(client.get(path, headers={STICKY_HEADER: "1"}).json()),
+        "far_future": len(client.get(path, headers={STICKY_HEADER: "9999999999"}).json()),
+        "sticky": len(client.get(path, headers={STICKY_HEADER: deadline}).json()),
+        "changes": len(client.get(path + "/changes").json()["comments"]),
+    }))
+""")
+
+
+def test_sticky_client_reads_its_write_from_primary(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-c", STICKY_READS_SCRIPT],
+        cwd=BACKEND_DIR,
+        env={
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'primary.db'}",
+            "DATABASE_REPLICA_URL": f"sqlite:///{tmp_path / 'replica.db'}",
+            "LOG_LEVEL": "WARNING",
+        },
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    counts = json.loads(result.stdout.strip().splitlines()[-1])
+    # The echoed header bypasses both the replica and the stale cached page;
+    # delta sync always reads the primary
+    assert counts == {"stale": 0, "expired": 0, "far_future": 0, "sticky": 1, "changes": 1}
+
+
+def _request(header=None, cookie=None) -> Request:
+    headers = []
+    if header is not None:
+        headers.append((STICKY_HEADER.lower().encode(), header.encode()))
+    if cookie is not None:
+        headers.append((b"cookie", f"{STICKY_COOKIE}={cookie}".encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("offset,sticky", [
+    (-1, False),  # expired
+    (REPLICA_STICKY_SECONDS / 2, True),
+    (REPLICA_STICKY_SECONDS + REPLICA_STICKY_CLOCK_SKEW_SECONDS / 2, True),  # another instance's clock is ahead
+    (REPLICA_STICKY_SECONDS + REPLICA_STICKY_CLOCK_SKEW_SECONDS + 60, False),  # further than any window
+])
+def test_sticky_deadline_must_fall_within_one_window(offset, sticky):
+    deadline = f"{time.time() + offset:.3f}"
+    assert client_is_sticky(_request(header=deadline)) is sticky
+    assert client_is_sticky(_request(cookie=deadline)) is sticky
+
+
+@pytest.mark.parametrize("value", ["9999999999", "inf", "nan", "soon"])
+def test_far_future_or_malformed_deadline_is_ignored(value):
+    assert not client_is_sticky(_request(header=value, cookie=value))
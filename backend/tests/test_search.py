@@ -0,0 +1,156 @@
+"""
+GET /comments/search on SQLite (FTS5): relevance order, soft-deleted comments
+excluded, video_id/from_ts/to_ts scoping, and cursor pages that together
+return every hit exactly once. Each test searches for its own made-up word, so
+comments written by other tests never match.
+"""
+import uuid
+
+import pytest
+
+from app.comment_writes import insert_comments
+from app.db import SessionLocal
+from app.models import Video
+
+
+def _word() -> str:
+    # Letters only, so the tokenizer keeps it as one term
+    return "zq" + "".join(chr(ord("a") + int(c, 16)) for c in uuid.uuid4().hex[:10])
+
+
+def _new_video() -> str:
+    db = SessionLocal()
+    try:
+        video = Video(id=str(uuid.uuid4()), title="Search video", video_url="https://example.invalid/v.mp4")
+        db.add(video)
+        db.commit()
+        return video.id
+    finally:
+        db.close()
+
+
+def _insert(video_id: str, bodies, timestamps=None):
+    """Insert comments with the given bodies; returns the stored rows in order"""
+    db = SessionLocal()
+    try:
+        stored = insert_comments(db, [
+            {"video_id": video_id, "author_id": f"user-{i}", "author_name": f"User {i}",
+             "timestamp_seconds": float(timestamps[i] if timestamps else i), "body": body}
+            for i, body in enumerate(bodies)
+        ])
+        db.commit()
+        return stored
+    finally:
+        db.close()
+
+
+def _delete(client, row):
+    response = client.delete(f"/videos/{row['video_id']}/comments/{row['id']}", params={"user_id": row["author_id"]})
+    assert response.status_code == 204
+
+
+def _search(client, q, **params):
+    response = client.get("/comments/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _ids(response):
+    return [hit["id"] for hit in response.json()]
+
+
+def _all_pages(client, q, **params):
+    """Follow X-Next-Cursor to the end; returns every hit in page order"""
+    hits, cursor = [], None
+    while True:
+        response = _search(client, q, **params, **({"cursor": cursor} if cursor else {}))
+        hits.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return hits
+
+
+def test_results_are_ranked_by_relevance(client, video_id):
+    word = _word()
+    stored = _insert(video_id, [
+        f"{word} once in a much longer comment about the match and the goal and the replay",
+        f"{word} {word} {word}",
+        f"{word} twice, {word}",
+        "no match here",
+    ])
+    hits = _search(client, word).json()
+    assert [hit["id"] for hit in hits] == [stored[1]["id"], stored[2]["id"], stored[0]["id"]]
+    ranks = [hit["rank"] for hit in hits]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+def test_stemming_and_every_term_must_match(client, video_id):
+    word = _word()
+    stored = _insert(video_id, [f"{word} goals", f"{word} goal", f"{word} replay"])
+    assert sorted(_ids(_search(client, f"{word} goal"))) == sorted([stored[0]["id"], stored[1]["id"]])
+    # Operators and quotes are plain text, not FTS5 syntax
+    assert _ids(_search(client, f'"{word}" OR NOT replay*')) == []
+
+
+def test_soft_deleted_comments_are_excluded(client, video_id):
+    word = _word()
+    stored = _insert(video_id, [f"{word} first", f"{word} second", f"{word} third"])
+    _delete(client, stored[1])
+    expected = sorted([stored[0]["id"], stored[2]["id"]])
+    # Unscoped and scoped searches take different query paths
+    assert sorted(_ids(_search(client, word))) == expected
+    assert sorted(_ids(_search(client, word, video_id=video_id))) == expected
+
+
+def test_scoped_to_video_and_time_window(client, video_id):
+    word = _word()
+    other_video_id = _new_video()
+    stored = _insert(video_id, [f"{word} a", f"{word} b", f"{word} c", f"{word} d"], timestamps=[5, 10, 20, 25])
+    other = _insert(other_video_id, [f"{word} elsewhere"], timestamps=[10])
+
+    assert sorted(_ids(_search(client, word))) == sorted([row["id"] for row in stored + other])
+    assert sorted(_ids(_search(client, word, video_id=video_id))) == sorted(row["id"] for row in stored)
+    assert _ids(_search(client, word, video_id=other_video_id)) == [other[0]["id"]]
+    # The window is inclusive at both ends
+    window = _search(client, word, video_id=video_id, from_ts=10, to_ts=20)
+    assert sorted(_ids(window)) == sorted([stored[1]["id"], stored[2]["id"]])
+    across_videos = _search(client, word, from_ts=10, to_ts=10)
+    assert sorted(_ids(across_videos)) == sorted([stored[1]["id"], other[0]["id"]])
+
+
+def test_unknown_video_and_empty_query(client):
+    assert client.get("/comments/search", params={"q": "hello", "video_id": "no-such-video"}).status_code == 404
+    assert client.get("/comments/search", params={"q": "?!"}).status_code == 400
+    assert client.get("/comments/search", params={"q": "hello", "cursor": "not-a-cursor"}).status_code == 400
+
+
+@pytest.mark.parametrize("scoped", [False, True])
+def test_cursor_pages_return_every_hit_once(client, video_id, scoped):
+    word = _word()
+    # Mostly identical bodies (equal scores, so the tiebreak decides the
+    # order) plus a few that rank higher
+    bodies = [f"{word} filler text"] * 20 + [f"{word} {word}"] * 3 + [f"{word} {word} {word}"] * 2
+    stored = _insert(video_id, bodies)
+    params = {"limit": 4, **({"video_id": video_id} if scoped else {})}
+
+    hits = _all_pages(client, word, **params)
+    ids = [hit["id"] for hit in hits]
+    assert len(ids) == len(set(ids)), "a hit was returned twice"
+    assert sorted(ids) == sorted(row["id"] for row in stored), "a hit was skipped"
+    ranks = [hit["rank"] for hit in hits]
+    assert ranks == sorted(ranks, reverse=True)
+    # Pages join without gaps: each page continues where the last one ended
+    assert ids == _ids(_search(client, word, **{**params, "limit": 100}))
+
+
+def test_cursor_pages_skip_many_soft_deleted_hits(client, video_id):
+    # More deleted matches in a row than the unscoped path over-fetches, so
+    # it has to rank further batches to fill a page
+    word = _word()
+    stored = _insert(video_id, [f"{word} {word} deleted"] * 15 + [f"{word} live"] * 6)
+    for row in stored[:15]:
+        _delete(client, row)
+
+    ids = [hit["id"] for hit in _all_pages(client, word, limit=4)]
+    assert sorted(ids) == sorted(row["id"] for row in stored[15:])
+    assert len(ids) == len(set(ids))
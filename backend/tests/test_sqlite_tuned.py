@@ -0,0 +1,99 @@
+"""
+Tuned SQLite mode: only write-path transactions take the write lock at BEGIN,
+and primary reads never wait for the single writer connection. Runs in a
+fresh interpreter, since the engines are configured at import time.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BEGIN_STATEMENTS_SCRIPT = textwrap.dedent("""
+    import json
+    from sqlalchemy import event, text
+    from app.db import SessionLocal, WriteSessionLocal, engine
+    from app.health import probe_database
+
+    begins = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("BEGIN"):
+            begins.append(statement)
+
+    def begin_of(run):
+        begins.clear()
+        run()
+        return begins[0] if begins else None
+
+    def select_in(session_factory):
+        db = session_factory()
+        try:
+            db.execute(text("SELECT 1"))
+        finally:
+            db.close()
+
+    print(json.dumps({
+        "write_session": begin_of(lambda: select_in(WriteSessionLocal)),
+        "session": begin_of(lambda: select_in(SessionLocal)),
+        "probe": begin_of(lambda: probe_database(engine)),
+    }))
+""")
+
+
+PRIMARY_READS_SCRIPT = textwrap.dedent("""
+    import json
+    from fastapi.testclient import TestClient
+    from app.auth import _user_cache, get_user, upsert_user
+    from app.db import engine
+    from app.main import app
+    from app.models import Base, Video
+    from sqlalchemy.orm import Session
+
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.add(Video(id="v1", title="Video", video_url="https://example.invalid/v.mp4"))
+        db.commit()
+    upsert_user({"sub": "u1", "email": "u1@example.invalid", "name": "U1"})
+    _user_cache.clear()
+
+    # Hold the only writer connection, as a long write would
+    with engine.connect():
+        changes = TestClient(app).get("/videos/v1/comments/changes")
+        user = get_user("u1")
+
+    print(json.dumps({"changes": changes.status_code, "user": user["id"] if user else None}))
+""")
+
+
+def _run_tuned(tmp_path, script: str, **env) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        env={
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'tuned.db'}",
+            "SQLITE_TUNED": "true",
+            "LOG_LEVEL": "WARNING",
+            **env,
+        },
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_only_write_sessions_begin_immediate(tmp_path):
+    begins = _run_tuned(tmp_path, BEGIN_STATEMENTS_SCRIPT)
+    assert begins == {"write_session": "BEGIN IMMEDIATE", "session": "BEGIN", "probe": "BEGIN"}
+
+
+def test_primary_reads_do_not_wait_for_the_writer(tmp_path):
+    # With the writer connection busy, a read through it would time out
+    reads = _run_tuned(tmp_path, PRIMARY_READS_SCRIPT, SQLITE_WRITER_TIMEOUT_SECONDS="1")
+    assert reads == {"changes": 200, "user": "u1"}
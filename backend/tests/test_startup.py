@@ -0,0 +1,76 @@
+"""
+Cold start: importing app.main must not touch the database or load the Google
+auth stack, and startup must stay fast. Runs in a fresh interpreter, since the
+test session has already imported the app.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous for CI machines; locally the import takes about 1s (mostly
+# FastAPI/pydantic) and startup about 30ms with schema checks, 1ms without
+IMPORT_BUDGET_SECONDS = 5.0
+STARTUP_BUDGET_SECONDS = 2.0
+FAST_STARTUP_BUDGET_SECONDS = 0.5
+
+COLD_START_SCRIPT = textwrap.dedent("""
+    import asyncio, json, os, sys, time
+
+    started = time.perf_counter()
+    import app.main
+    imported = time.perf_counter() - started
+    database_created = os.path.exists(os.environ["TEST_DATABASE_PATH"])
+    heavy_modules = sorted(
+        name for name in sys.modules if name.split(".")[0] in ("google", "requests")
+    )
+
+    started = time.perf_counter()
+    asyncio.run(app.main.app.router.startup())
+    startup = time.perf_counter() - started
+    asyncio.run(app.main.app.router.shutdown())
+
+    print(json.dumps({
+        "import_seconds": imported,
+        "database_created": database_created,
+        "heavy_modules": heavy_modules,
+        "startup_seconds": startup,
+    }))
+""")
+
+
+def _cold_start(tmp_path, **env) -> dict:
+    database_path = tmp_path / "cold.db"
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT],
+        cwd=BACKEND_DIR,
+        env={
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{database_path}",
+            "TEST_DATABASE_PATH": str(database_path),
+            "LOG_LEVEL": "WARNING",
+            **env,
+        },
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_side_effect_free_and_fast(tmp_path):
+    report = _cold_start(tmp_path, FAST_START="false")
+    assert not report["database_created"]
+    assert report["heavy_modules"] == []
+    assert report["import_seconds"] < IMPORT_BUDGET_SECONDS, report
+    # Schema creation and checks on an empty database
+    assert report["startup_seconds"] < STARTUP_BUDGET_SECONDS, report
+
+
+def test_fast_start_skips_schema_work(tmp_path):
+    report = _cold_start(tmp_path, FAST_START="true")
+    assert report["startup_seconds"] < FAST_STARTUP_BUDGET_SECONDS, report
@@ -0,0 +1,89 @@
+"""
+Incremental per-video comment stats stay equal to a full recount, and a
+batch of comments updates the author counts with a single upsert statement.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from sqlalchemy import event
+
+from app.comment_writes import insert_comments
+from app.db import SessionLocal, engine
+from app.models import Comment, Video
+from app.video_stats import reconcile_video_stats
+
+
+def _stats(video_id: str):
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.id == video_id).one()
+        return video.comment_count, video.author_count
+    finally:
+        db.close()
+
+
+def _insert(video_id: str, authors):
+    db = SessionLocal()
+    try:
+        insert_comments(db, [
+            {"video_id": video_id, "author_id": author_id, "author_name": author_name,
+             "timestamp_seconds": float(i), "body": "hello"}
+            for i, (author_id, author_name) in enumerate(authors)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_batch_insert_counts_new_authors_once(video_id):
+    _insert(video_id, [("a", "A"), ("b", "B"), ("a", "A"), (None, "Guest"), (None, "Guest")])
+    assert _stats(video_id) == (5, 3)
+    _insert(video_id, [("a", "A"), ("c", "C"), (None, "Other guest")])
+    assert _stats(video_id) == (8, 5)
+
+    db = SessionLocal()
+    try:
+        reconcile_video_stats(db, video_id)
+    finally:
+        db.close()
+    assert _stats(video_id) == (8, 5)
+
+
+def test_author_counts_use_one_statement_per_batch(video_id):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "comment_author_counts" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _insert(video_id, [(f"user-{i}", f"User {i}") for i in range(50)])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert len(statements) == 1, statements
+    assert _stats(video_id) == (50, 50)
+
+
+def test_concurrent_deletes_of_one_comment_count_once(client, video_id):
+    _insert(video_id, [("a", "A"), ("b", "B")])
+    db = SessionLocal()
+    try:
+        comment = db.query(Comment).filter(Comment.video_id == video_id, Comment.author_id == "a").one()
+        comment_id = comment.id
+    finally:
+        db.close()
+
+    barrier = threading.Barrier(8)
+
+    def delete():
+        barrier.wait()
+        return client.delete(f"/videos/{video_id}/comments/{comment_id}", params={"user_id": "a"}).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(lambda _: delete(), range(8)))
+    assert statuses == [204] * 8
+    assert _stats(video_id) == (1, 1)
+
+    histogram = client.get(f"/videos/{video_id}/comments/histogram", params={"resolution": 1}).json()
+    assert sum(bucket["count"] for bucket in histogram["buckets"]) == 1
@@ -326,10 +326,10 @@ function App() {
       setVideosError(null)
       
       getVideos()
-        .then((videos) => {
+        .then(({ items: videos }) => {
           // If no videos, seed the database
           if (videos.length === 0) {
-            return seedDatabase().then(() => getVideos())
+            return seedDatabase().then(() => getVideos()).then(({ items }) => items)
           }
           return videos
         })
@@ -34,22 +34,51 @@ if (typeof window !== 'undefined') {
   console.log(`[API] Using base URL: ${API_BASE_URL || '(relative URLs)'}`)
 }
 
+/**
+ * Read-your-writes: after a write the backend returns X-Read-Primary-Until (a
+ * server-clock deadline in epoch seconds). Echoing it makes reads skip the
+ * read replica and the page cache until then. It is sent a little past the
+ * deadline by the local clock (the server ignores expired values), so modest
+ * clock skew cannot cut the window short.
+ */
+const READ_PRIMARY_HEADER = 'X-Read-Primary-Until';
+const READ_PRIMARY_SKEW_SECONDS = 30;
+let readPrimaryUntil = null;
+
+function rememberReadPrimary(response) {
+  const value = response.headers.get(READ_PRIMARY_HEADER);
+  if (value) {
+    readPrimaryUntil = value;
+  }
+}
+
+function readPrimaryHeaders() {
+  if (readPrimaryUntil && Date.now() / 1000 < Number(readPrimaryUntil) + READ_PRIMARY_SKEW_SECONDS) {
+    return { [READ_PRIMARY_HEADER]: readPrimaryUntil };
+  }
+  readPrimaryUntil = null;
+  return {};
+}
+
 /**
  * Generic API request handler
+ * Returns { data, headers } so callers can read response headers (e.g. X-Next-Cursor)
  */
-async function apiRequest(endpoint, options = {}) {
+async function apiRequestWithHeaders(endpoint, options = {}) {
   // Handle relative URLs in production (when API_BASE_URL is empty)
   const url = API_BASE_URL ? `${API_BASE_URL}${endpoint}` : endpoint;
   const config = {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...readPrimaryHeaders(),
       ...options.headers,
     },
-    ...options,
   };
 
   try {
     const response = await fetch(url, config);
+    rememberReadPrimary(response);
     
     if (!response.ok) {
       // Try to parse error message from response
@@ -70,7 +99,7 @@ async function apiRequest(endpoint, options = {}) {
       throw error;
     }
     
-    return await response.json();
+    return { data: await response.json(), headers: response.headers };
   } catch (error) {
     // Provide user-friendly error messages
     if (error.message.includes('Failed to fetch') || error.message.includes('ERR_CONNECTION_REFUSED') || error.message.includes('NetworkError')) {
@@ -84,6 +113,14 @@ async function apiRequest(endpoint, options = {}) {
   }
 }
 
+/**
+ * API request returning only the parsed JSON body
+ */
+async function apiRequest(endpoint, options = {}) {
+  const { data } = await apiRequestWithHeaders(endpoint, options);
+  return data;
+}
+
 /**
  * Health check
  */
@@ -126,10 +163,20 @@ export async function authGoogle(idToken) {
 }
 
 /**
- * Get all videos
+ * Get videos, newest first
+ * Optional { limit, cursor, fields }: with limit, pass the returned nextCursor
+ * as cursor to get the next page (null on the last page); fields limits the
+ * returned columns
+ * Returns { items, nextCursor }
  */
-export async function getVideos() {
-  return apiRequest('/videos');
+export async function getVideos({ limit, cursor, fields } = {}) {
+  const params = new URLSearchParams();
+  if (limit) params.set('limit', limit);
+  if (cursor) params.set('cursor', cursor);
+  if (fields) params.set('fields', Array.isArray(fields) ? fields.join(',') : fields);
+  const query = params.toString();
+  const { data, headers } = await apiRequestWithHeaders(query ? `/videos?${query}` : '/videos');
+  return { items: data, nextCursor: headers.get('X-Next-Cursor') };
 }
 
 /**
@@ -146,6 +193,70 @@ export async function getComments(videoId) {
   return apiRequest(`/videos/${videoId}/comments`);
 }
 
+/**
+ * Get up to `limit` comments using the compact columnar format (smaller and
+ * cheaper to serialize for bulk loads); returns the same comment objects as getComments
+ */
+export async function getCommentsColumnar(videoId, limit = 500) {
+  const data = await apiRequest(`/videos/${videoId}/comments?format=columnar&limit=${limit}`);
+  return data.ids.map((id, i) => ({
+    id,
+    video_id: data.video_id,
+    author_name: data.author_names[i],
+    author_id: data.author_ids[i],
+    timestamp_seconds: data.timestamps[i],
+    body: data.bodies[i],
+    created_at: data.created_at[i],
+  }));
+}
+
+/**
+ * Get comment density for timeline markers
+ * resolution: bucket width in seconds (1, 5 or 30)
+ */
+export async function getCommentHistogram(videoId, resolution = 5) {
+  return apiRequest(`/videos/${videoId}/comments/histogram?resolution=${resolution}`);
+}
+
+/**
+ * Full-text search over comment bodies, best matches first
+ * Optional { videoId, fromTs, toTs, limit, cursor }: pass the returned
+ * nextCursor as cursor to get the next page (null on the last page)
+ * Returns { items, nextCursor }
+ */
+export async function searchComments(q, { videoId, fromTs, toTs, limit, cursor } = {}) {
+  const params = new URLSearchParams({ q });
+  if (videoId) params.set('video_id', videoId);
+  if (fromTs != null) params.set('from_ts', fromTs);
+  if (toTs != null) params.set('to_ts', toTs);
+  if (limit) params.set('limit', limit);
+  if (cursor) params.set('cursor', cursor);
+  const { data, headers } = await apiRequestWithHeaders(`/comments/search?${params.toString()}`);
+  return { items: data, nextCursor: headers.get('X-Next-Cursor') };
+}
+
+/**
+ * Subscribe to live comment events for a video (Server-Sent Events)
+ * handlers: { onCreated(comment), onDeleted({ id, video_id, deleted_at }), onError(event) }
+ * Returns the EventSource; call .close() to unsubscribe
+ */
+export function subscribeToComments(videoId, handlers = {}) {
+  const endpoint = `/videos/${videoId}/comments/stream`
+  const url = API_BASE_URL ? `${API_BASE_URL}${endpoint}` : endpoint
+  const source = new EventSource(url)
+
+  source.addEventListener('comment.created', (event) => {
+    handlers.onCreated?.(JSON.parse(event.data))
+  })
+  source.addEventListener('comment.deleted', (event) => {
+    handlers.onDeleted?.(JSON.parse(event.data))
+  })
+  source.onerror = (event) => {
+    handlers.onError?.(event)
+  }
+  return source
+}
+
 /**
  * Create a comment for a video
  */
@@ -181,8 +292,10 @@ export async function deleteComment(videoId, commentId, userId = null) {
     method: 'DELETE',
     headers: {
       'Content-Type': 'application/json',
+      ...readPrimaryHeaders(),
     },
   })
+  rememberReadPrimary(response)
   
   if (!response.ok) {
     if (response.status === 403) {